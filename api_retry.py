@@ -0,0 +1,129 @@
+import random
+import threading
+import time
+import weakref
+from metrics import count
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = ('APIConnectionError', 'APITimeoutError')
+
+
+def is_retryable(error):
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def retry_after_seconds(error):
+    """The server's requested wait from Retry-After(-ms) headers, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return None
+
+
+class RateLimitGate:
+    """
+    Shared by every caller of one API. After a 429 all callers hold off
+    until the server's Retry-After has passed, and the number of calls
+    allowed in flight is halved (from however many were in flight), once
+    per burst of 429s. It grows back by one after every `recover_after`
+    successful calls.
+    """
+
+    def __init__(self, recover_after=5):
+        self.recover_after = recover_after
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.limit = None  # No cap until the first 429
+        self.resume_at = 0.0
+        self._successes = 0
+        self._cuts = 0
+
+    def acquire(self):
+        """Wait for a slot; returns a token to hand back to release()."""
+        with self._condition:
+            while True:
+                wait = self.resume_at - time.monotonic()
+                if wait <= 0 and (self.limit is None or self.in_flight < self.limit):
+                    self.in_flight += 1
+                    return self._cuts
+                self._condition.wait(wait if wait > 0 else None)
+
+    def release(self, token, rate_limited=False, delay=0.0):
+        with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self.resume_at = max(self.resume_at, time.monotonic() + delay)
+                self._successes = 0
+                # Calls started before the last cut were part of the same burst
+                if token == self._cuts:
+                    self.limit = max(1, (self.limit or self.in_flight + 1) // 2)
+                    self._cuts += 1
+                    count('rate_limit_backoffs')
+            elif self.limit is not None:
+                self._successes += 1
+                if self._successes >= self.recover_after:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+_gates = weakref.WeakKeyDictionary()
+_gates_lock = threading.Lock()
+
+
+def rate_limit_gate(client, endpoint):
+    """
+    The RateLimitGate for one endpoint ('chat', 'tts', ...) of an API
+    client, shared by everything that calls it through that client.
+    """
+    with _gates_lock:
+        gates = _gates.setdefault(client, {})
+        if endpoint not in gates:
+            gates[endpoint] = RateLimitGate()
+        return gates[endpoint]
+
+
+def retry_delay(error, attempt, base_delay, max_delay):
+    delay = retry_after_seconds(error)
+    if delay is not None:
+        # Never earlier than asked, but spread out so callers that were
+        # limited together don't all come back at the same instant
+        return min(max_delay, delay * random.uniform(1.0, 1.5))
+    # Jitter keeps parallel workers from retrying in lockstep
+    return min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def call_with_retry(func, max_retries=4, base_delay=1.0, max_delay=30.0, gate=None):
+    """
+    Call `func()` and retry rate-limit, server and connection errors with
+    exponential backoff and jitter, honouring Retry-After when sent. With a
+    `gate` (RateLimitGate), every attempt waits for the gate, and a 429
+    makes all of its callers back off together.
+    """
+    for attempt in range(max_retries + 1):
+        if gate is not None:
+            token = gate.acquire()
+        try:
+            result = func()
+        except Exception as error:
+            delay = retry_delay(error, attempt, base_delay, max_delay)
+            if gate is not None:
+                gate.release(token, rate_limited=getattr(error, 'status_code', None) == 429,
+                             delay=retry_after_seconds(error) or delay)
+            if attempt == max_retries or not is_retryable(error):
+                raise
+            count('api_retries', error=type(error).__name__)
+            time.sleep(delay)
+            continue
+        if gate is not None:
+            gate.release(token)
+        return result
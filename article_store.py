@@ -0,0 +1,162 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from fingerprint import bytes_fingerprint
+from metrics import count
+
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'cmpid', 'ref')
+
+
+def normalize_url(url):
+    """Canonical form of an article URL so tracking variants share one row."""
+    parts = urlsplit(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query)
+             if not key.lower().startswith(TRACKING_PARAMS)]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path,
+                       urlencode(sorted(query)), ''))
+
+
+def content_hash(html):
+    return bytes_fingerprint(html)
+
+
+class ArticleStore:
+    """
+    SQLite store of parsed articles keyed by normalized URL, so known
+    stories skip newspaper's parse() and nlp() on later refreshes.
+
+    A stored row is trusted for `recheck_after` seconds. After that the
+    page is downloaded again (usually a cheap HTTP cache hit) and only
+    reparsed if its content hash changed. Rows not seen for `max_age_days`
+    are dropped and the table is capped at `max_rows`.
+    """
+
+    def __init__(self, db_path='.cache/articles.sqlite3', recheck_after=6 * 3600,
+                 max_age_days=14, max_rows=5000):
+        self.recheck_after = recheck_after
+        self.max_age_days = max_age_days
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._puts = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS articles (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    title TEXT,
+                    summary TEXT,
+                    date TEXT,
+                    source TEXT,
+                    extracted_at REAL NOT NULL,
+                    checked_at REAL NOT NULL,
+                    text TEXT,
+                    authors TEXT
+                )''')
+            # Stores created before text and authors were kept
+            columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(articles)')}
+            for column in ('text', 'authors'):
+                if column not in columns:
+                    self.conn.execute(f'ALTER TABLE articles ADD COLUMN {column} TEXT')
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_articles_checked ON articles(checked_at)')
+        self.prune()
+
+    @staticmethod
+    def _article(row):
+        if row is None:
+            return None
+        article = dict(row)
+        article['authors'] = json.loads(article['authors'])
+        return article
+
+    def get(self, url):
+        """Return the stored article if it was verified recently enough."""
+        # Rows from before text was stored count as missing, so they're re-extracted once
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT * FROM articles WHERE url = ? AND checked_at >= ? AND text IS NOT NULL',
+                (normalize_url(url), time.time() - self.recheck_after)
+            ).fetchone()
+        return self._article(row)
+
+    def match(self, url, html):
+        """Return the stored article if the page content is unchanged."""
+        key = normalize_url(url)
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                'SELECT * FROM articles WHERE url = ? AND content_hash = ? AND text IS NOT NULL',
+                (key, content_hash(html))
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    'UPDATE articles SET checked_at = ? WHERE url = ?',
+                    (time.time(), key))
+        return self._article(row)
+
+    def load(self, url, fetch_html, extract):
+        """
+        Return parsed article data for `url`, calling `fetch_html(url)` only
+        once the stored row is due a recheck and `extract(url, html)` only for
+        new or changed pages.
+        """
+        stored = self.get(url)
+        if stored is not None:
+            count('article_store', result='fresh')
+            return stored
+        html = fetch_html(url)
+        stored = self.match(url, html)
+        if stored is not None:
+            count('article_store', result='unchanged')
+            return stored
+        stored = extract(url, html)
+        self.put(url, html, stored)
+        count('article_store', result='extracted')
+        return stored
+
+    def put(self, url, html, article_data):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                '''INSERT OR REPLACE INTO articles
+                   (url, content_hash, title, summary, date, source, extracted_at, checked_at,
+                    text, authors)
+                   VALUES (?, ?, ?, ?, ?,
+                           (SELECT source FROM articles WHERE url = ?), ?, ?, ?, ?)''',
+                (normalize_url(url), content_hash(html), article_data['title'],
+                 article_data['summary'], article_data['date'],
+                 normalize_url(url), now, now,
+                 article_data.get('text') or '', json.dumps(article_data.get('authors') or [])))
+            self._puts += 1
+            prune_due = self._puts % 100 == 0
+        if prune_due:
+            self.prune()
+
+    def set_source(self, url, source):
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE articles SET source = ? WHERE url = ?',
+                              (source, normalize_url(url)))
+
+    def prune(self):
+        """Apply the retention policy: age limit first, then row cap."""
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock, self.conn:
+            self.conn.execute(
+                'DELETE FROM articles WHERE checked_at < ?', (cutoff,))
+            self.conn.execute(
+                '''DELETE FROM articles WHERE url NOT IN (
+                       SELECT url FROM articles ORDER BY checked_at DESC LIMIT ?)''',
+                (self.max_rows,))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,107 @@
+import os
+import threading
+from fingerprint import content_fingerprint
+from metrics import count
+
+
+def pick_voice(voice_options, seed):
+    """Same seed, same voice: keeps cache keys stable across reruns."""
+    return voice_options[int(content_fingerprint(seed), 16) % len(voice_options)]
+
+
+class AudioCache:
+    """
+    Content-addressed store of synthesized speech. Each file is named by the
+    fingerprint of (text, voice, model, format), so identical requests map
+    to the same file whatever the feed order. The directory is kept under
+    `max_bytes` by evicting least recently used files (by mtime).
+    """
+
+    def __init__(self, cache_dir='.cache/audio', max_bytes=500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._building = {}
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def path_for(self, text, voice, model, audio_format='mp3'):
+        key = content_fingerprint(text, voice, model, audio_format)
+        return os.path.join(self.cache_dir, f"{key}.{audio_format}")
+
+    def get_or_create(self, text, voice, model, synthesize, audio_format='mp3'):
+        """
+        Return the cached file for this request, calling `synthesize(path)`
+        to write it on a miss. Concurrent requests for the same audio wait
+        for the first one instead of synthesizing twice.
+        """
+        path = self.path_for(text, voice, model, audio_format)
+        with self._lock:
+            if os.path.exists(path):
+                self.hits += 1
+                count('audio_cache', result='hit')
+                os.utime(path)  # mark as recently used
+                return path
+            building = self._building.get(path)
+            if building is None:
+                building = self._building[path] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            building.wait()
+            return path if os.path.exists(path) else None
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            try:
+                synthesize(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            count('audio_cache', result='miss')
+            with self._lock:
+                self.misses += 1
+                self.total_bytes += os.path.getsize(path)
+            self._evict()
+            return path
+        finally:
+            with self._lock:
+                self._building.pop(path, None)
+            building.set()
+
+    def _evict(self):
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            for _, path, size in sorted(self._entries()):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self.total_bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'bytes': self.total_bytes}
@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from nltk_setup import ensure_punkt
+from metrics import count
+
+# One piece per line inside a request; translation keeps line breaks
+PIECE_SEPARATOR = '\n'
+
+
+def split_long(sentence, limit):
+    """Last resort for a single sentence over the limit: split on words."""
+    parts, current = [], ''
+    for word in sentence.split():
+        while len(word) > limit:
+            if current:
+                parts.append(current)
+                current = ''
+            parts.append(word[:limit])
+            word = word[limit:]
+        if current and len(current) + 1 + len(word) > limit:
+            parts.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        parts.append(current)
+    return parts
+
+
+def sentence_split(text):
+    # NLTK is only imported (and its data checked) for over-long lines
+    from nltk.tokenize import sent_tokenize
+
+    ensure_punkt()
+    return sent_tokenize(text)
+
+
+def split_text(text, limit):
+    """
+    Break `text` into newline-free pieces of at most `limit` characters,
+    cutting only between sentences (or words, for a monster sentence).
+    Returns (piece, joiner) pairs where joiner rebuilds the original layout.
+    """
+    pieces = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        joiner = '\n' if pieces else ''
+        sentences = [line] if len(line) <= limit else sentence_split(line)
+        for sentence in sentences:
+            for part in ([sentence] if len(sentence) <= limit else split_long(sentence, limit)):
+                pieces.append((part, joiner))
+                joiner = ' '
+    return pieces
+
+
+def pack_chunks(pieces, limit):
+    """Greedily pack pieces into the fewest requests under `limit` chars."""
+    chunks, current, size = [], [], 0
+    for piece in pieces:
+        extra = len(piece) + (len(PIECE_SEPARATOR) if current else 0)
+        if current and size + extra > limit:
+            chunks.append(current)
+            current, size = [], 0
+            extra = len(piece)
+        current.append(piece)
+        size += extra
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BatchTranslator:
+    """
+    Translate many texts (e.g. every title and summary in the feed) with as
+    few provider requests as possible, sent concurrently.
+    """
+
+    def __init__(self, make_translator, max_chunk_chars=4500, max_workers=4):
+        # Translator objects keep per-request state, so each request gets a
+        # fresh one from `make_translator(target_lang)`
+        self.make_translator = make_translator
+        self.max_chunk_chars = max_chunk_chars
+        self.max_workers = max_workers
+
+    def _translate_chunk(self, chunk, target_lang):
+        translator = self.make_translator(target_lang)
+        count('api_calls', service='translate', lang=target_lang)
+        translated = translator.translate(PIECE_SEPARATOR.join(chunk)) or ''
+        lines = [line.strip() for line in translated.split(PIECE_SEPARATOR) if line.strip()]
+        if len(lines) == len(chunk):
+            return lines
+        # The provider merged or split lines; redo this chunk piece by piece
+        count('api_calls', len(chunk), service='translate', lang=target_lang)
+        return [translator.translate(piece) or piece for piece in chunk]
+
+    def translate(self, texts, target_lang):
+        layouts = [split_text(text, self.max_chunk_chars) for text in texts]
+        pieces = [piece for layout in layouts for piece, _ in layout]
+        if not pieces:
+            return list(texts)
+
+        chunks = pack_chunks(pieces, self.max_chunk_chars)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            results = pool.map(
+                lambda chunk: self._translate_chunk(chunk, target_lang), chunks)
+            translated_pieces = iter([piece for result in results for piece in result])
+
+        translations = []
+        for layout in layouts:
+            translations.append(''.join(
+                joiner + next(translated_pieces) for _, joiner in layout))
+        return translations
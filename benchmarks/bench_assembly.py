@@ -0,0 +1,93 @@
+"""
+Compare podcast assembly strategies on a long synthetic episode.
+
+    python benchmarks/bench_assembly.py --segments 200 --seconds 20
+
+Segments are built from real MPEG-2 Layer III frames in the TTS output
+format (24 kHz mono), so the frame assembler does its normal work. The
+pydub path (decode, concat, re-encode) runs only if pydub and ffmpeg are
+installed.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mp3_assembly import Mp3Assembler, build_header, parse_header  # noqa: E402
+
+PAUSE_AFTER = 0.5
+
+
+def make_segment(path, seconds, bitrate=64000):
+    header_bytes = build_header(bitrate=bitrate)
+    header = parse_header(header_bytes + b'\x00' * 4)
+    frame = header_bytes + os.urandom(header.frame_length - 4)
+    count = round(seconds * header.sample_rate / header.samples)
+    with open(path, 'wb') as f:
+        f.write(b'ID3\x03\x00\x00\x00\x00\x00\x00')  # empty ID3v2 tag, as TTS output has
+        f.write(frame * count)
+
+
+def assemble_frames(paths, output_path):
+    with Mp3Assembler(output_path) as assembler:
+        for path in paths:
+            assembler.add_file(path)
+            assembler.add_silence(PAUSE_AFTER)
+
+
+def assemble_with_pydub(paths, output_path):
+    from pydub import AudioSegment
+
+    final_audio = AudioSegment.empty()
+    for path in paths:
+        final_audio += AudioSegment.from_mp3(path)
+        final_audio += AudioSegment.silent(duration=int(PAUSE_AFTER * 1000))
+    final_audio.export(output_path, format="mp3")
+
+
+def measure(name, assemble, paths, output_path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        assemble(paths, output_path)
+    except Exception as e:
+        tracemalloc.stop()
+        print(f"{name:<8} skipped: {e}")
+        return
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = os.path.getsize(output_path)
+    print(f"{name:<8} {elapsed:8.3f}s  peak {peak / 2**20:8.1f} MiB  output {size / 2**20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--segments', type=int, default=120)
+    parser.add_argument('--seconds', type=float, default=15.0,
+                        help='length of each segment')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_assembly_')
+    try:
+        paths = []
+        for i in range(args.segments):
+            path = os.path.join(workdir, f'segment_{i}.mp3')
+            make_segment(path, args.seconds)
+            paths.append(path)
+        minutes = args.segments * (args.seconds + PAUSE_AFTER) / 60
+        print(f"{args.segments} segments, ~{minutes:.0f} min episode")
+
+        measure('frames', assemble_frames, paths, os.path.join(workdir, 'frames.mp3'))
+        measure('pydub', assemble_with_pydub, paths, os.path.join(workdir, 'pydub.mp3'))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
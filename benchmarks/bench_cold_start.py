@@ -0,0 +1,90 @@
+"""
+Cold-start time to first render for each entry point.
+
+    python benchmarks/bench_cold_start.py --runs 5
+
+Every sample runs in a fresh interpreter, so nothing is warm in
+sys.modules. The Streamlit apps run headless under streamlit.testing's
+AppTest, timing the first script run: what a new visitor waits for, not
+counting the server's own startup. article.py is a CLI, so its import time
+is reported instead. Run it on an older checkout to compare, or add
+--importtime to see which modules dominate.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STREAMLIT_APPS = ['podcast.py', 'main_2.py', 'main.py']
+MODULES = ['article']
+
+APP_PROBE = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=300)
+start = time.perf_counter()
+app.run()
+print(time.perf_counter() - start)
+"""
+
+MODULE_PROBE = """
+import importlib, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+
+def sample(probe, target, importtime=False):
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'sk-benchmark')  # never used for a request
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else [])
+    result = subprocess.run(command + ['-c', probe, target], cwd=REPO, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines() or ['no output']
+        raise RuntimeError(lines[-1])
+    if importtime:
+        print_slowest_imports(result.stderr)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def print_slowest_imports(report, count=10):
+    rows = []
+    for line in report.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].strip()))
+    for cumulative, name in sorted(rows, reverse=True)[:count]:
+        print(f"    {cumulative / 1e6:7.3f}s  {name}")
+
+
+def measure(label, probe, target, runs, importtime):
+    times = []
+    for run in range(runs):
+        try:
+            times.append(sample(probe, target, importtime and run == 0))
+        except RuntimeError as e:
+            print(f"{label:<22} failed: {e}")
+            return
+    print(f"{label:<22} median {statistics.median(times):6.3f}s  "
+          f"min {min(times):6.3f}s  max {max(times):6.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true',
+                        help='print the slowest imports of the first run')
+    args = parser.parse_args()
+
+    for app in STREAMLIT_APPS:
+        measure(f"{app} first render", APP_PROBE, app, args.runs, args.importtime)
+    for module in MODULES:
+        measure(f"{module} import", MODULE_PROBE, module, args.runs, args.importtime)
+
+
+if __name__ == '__main__':
+    main()
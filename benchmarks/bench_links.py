@@ -0,0 +1,93 @@
+"""
+Benchmark homepage link extraction: the BeautifulSoup path get_links used
+before link_extraction.py, against its html.parser and lxml engines.
+
+    python benchmarks/bench_links.py --fixtures benchmarks/fixtures
+    python benchmarks/bench_links.py --page-kb 400 --repeat 20
+
+Runs every engine over recorded homepages (see fixture_server.py record)
+or synthetic ones, reports the median milliseconds per page and checks
+that each engine finds the same links as the BeautifulSoup path. Engines
+whose parser isn't installed are skipped.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import load_fixtures, synthetic_fixtures  # noqa: E402
+from link_extraction import (compile_selectors, links_with_html_parser,  # noqa: E402
+                             links_with_lxml, links_with_soup)
+
+ENGINES = {
+    'bs4 (before)': lambda content, selectors: links_with_soup(content, selectors),
+    'html.parser': lambda content, selectors: links_with_html_parser(
+        content, compile_selectors(selectors), 'utf-8'),
+    'lxml': lambda content, selectors: links_with_lxml(
+        content, compile_selectors(selectors), 'utf-8'),
+}
+
+
+def homepages(sites):
+    """(source name, selector string, homepage bytes) for each site."""
+    return [(source_name, site['config']['article_link_selector'], site['pages'][site['home']])
+            for source_name, site in sites.items()]
+
+
+def time_engine(extract, pages, repeat):
+    """Median seconds per page over `repeat` rounds, and the links found per source."""
+    found = {}
+    timings = []
+    for _ in range(repeat):
+        for source_name, selectors, content in pages:
+            start = time.perf_counter()
+            found[source_name] = extract(content, selectors)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', help='recorded fixture directory (default: synthetic sites)')
+    parser.add_argument('--page-kb', type=int, default=200,
+                        help='size of the synthetic homepages')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fixtures:
+        sites = load_fixtures(args.fixtures)
+    else:
+        try:
+            sites = synthetic_fixtures(
+                articles_per_source=30, page_kb=args.page_kb, seed=args.seed)
+        except ImportError as e:
+            print(f"skipped: {e}")
+            return
+    pages = homepages(sites)
+    size = sum(len(content) for _, _, content in pages) / len(pages)
+    print(f"{len(pages)} homepages, {size / 1024:.0f} KiB on average, {args.repeat} rounds")
+
+    reference = None
+    for name, extract in ENGINES.items():
+        try:
+            median, found = time_engine(extract, pages, args.repeat)
+        except ImportError as e:
+            print(f"  {name:<14} skipped: {e}")
+            continue
+        links = sum(len(set(hrefs)) for hrefs in found.values())
+        if reference is None:
+            reference = found
+            check = 'reference'
+        else:
+            mismatched = [source_name for source_name in found
+                          if set(found[source_name]) != set(reference[source_name])]
+            check = f"differs for {', '.join(mismatched)}" if mismatched else 'same links'
+        print(f"  {name:<14} {median * 1000:8.2f} ms/page  {links:4d} links  {check}")
+
+
+if __name__ == '__main__':
+    main()
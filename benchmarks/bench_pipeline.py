@@ -0,0 +1,198 @@
+"""
+Benchmark the digest pipeline end to end against local fake services.
+
+    python benchmarks/bench_pipeline.py --workers 1 2 4 8
+    python benchmarks/bench_pipeline.py --scrape --rate-limit 3 --tts-latency 0.8
+
+Stages: scrape (with --scrape, against the fixture server from
+fixture_server.py; otherwise synthetic articles), translation into the
+pre-translated languages, per-article summary audio, a full podcast
+episode, an incremental episode from empty caches, and the incremental
+episode again after one story changes. OpenAI and Google Translate are
+replaced by fake_services.py, so nothing is paid for and latencies are
+repeatable. Each worker count runs from empty caches; every stage
+reports wall time, traced peak memory and the fake API calls it made.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_cache import AudioCache  # noqa: E402
+from fake_services import FakeOpenAI, FakeTranslationService  # noqa: E402
+from fingerprint import content_fingerprint  # noqa: E402
+from fixture_server import SYLLABLES  # noqa: E402
+from podcast_cache import PodcastCache  # noqa: E402
+from podcast_generator import PodcastGenerator  # noqa: E402
+from speech import TextToSpeech  # noqa: E402
+from translation import LanguageConfig, ArticleTranslator  # noqa: E402
+from translation_cache import TranslationCache  # noqa: E402
+
+
+def synthetic_articles(count, seed=0):
+    rng = random.Random(seed)
+
+    def sentence(length):
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+                 for _ in range(length)]
+        return ' '.join(words).capitalize() + '.'
+
+    articles = []
+    for number in range(count):
+        title = sentence(8)[:-1]
+        summary = ' '.join(sentence(rng.randint(12, 20)) for _ in range(4))
+        articles.append({
+            'url': f'https://example.com/story/{number}',
+            'source': f'Source {number % 3}',
+            'title': title,
+            'summary': summary,
+            'text_hash': content_fingerprint(title, summary)
+        })
+    return articles
+
+
+def scrape_articles(args, workers, workdir):
+    """A live scrape_news against the fixture server's synthetic sites."""
+    from fixture_server import ServerProcess, synthetic_fixtures
+    from news_scraper import NewsContentScraper, PODCAST_PROFILE
+
+    sites = synthetic_fixtures(seed=args.seed)
+    with ServerProcess(sites, latency=args.http_latency) as server:
+        profile = dict(
+            PODCAST_PROFILE,
+            sources={source_name: dict(site['config'], url=server.urls[source_name])
+                     for source_name, site in sites.items()},
+            max_workers=workers
+        )
+        scraper = NewsContentScraper(
+            **profile, cache_dir=os.path.join(workdir, 'http'),
+            article_db=os.path.join(workdir, 'articles.sqlite3'),
+            on_error=lambda message: None)
+        try:
+            return scraper.scrape_news(total_articles=args.articles)
+        finally:
+            scraper.http.close()
+            scraper.article_store.close()
+
+
+class PipelineRun:
+    """One pass over every stage with a given worker count and empty caches."""
+
+    def __init__(self, args, workers):
+        self.args = args
+        self.workers = workers
+        self.workdir = tempfile.mkdtemp(prefix='bench_pipeline_')
+        self.openai = FakeOpenAI(
+            chat_latency=args.chat_latency, chunk_interval=0, tts_latency=args.tts_latency,
+            tts_seconds_per_char=args.tts_seconds_per_char, max_concurrency=args.rate_limit)
+        self.translation = FakeTranslationService(latency=args.translate_latency)
+        self.errors = []
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def generator(self, name):
+        return PodcastGenerator(
+            self.openai, max_workers=self.workers,
+            cache=PodcastCache(self.path(f'{name}/podcasts')),
+            audio_cache=AudioCache(self.path(f'{name}/audio')),
+            on_error=self.errors.append,
+            on_status=lambda message: None)
+
+    def stage(self, name, func):
+        before = self.openai.stats()
+        translations_before = self.translation.stats()['calls']
+        errors_before = len(self.errors)
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        after = self.openai.stats()
+        calls = (f"chat {after['chat']['calls'] - before['chat']['calls']:3d}  "
+                 f"tts {after['tts']['calls'] - before['tts']['calls']:3d}  "
+                 f"translate {self.translation.stats()['calls'] - translations_before:3d}")
+        rejected = sum(after[endpoint]['rejected'] - before[endpoint]['rejected']
+                       for endpoint in after)
+        print(f"  {name:<22} {elapsed:8.3f}s  peak {peak / 2**20:6.1f} MiB  "
+              f"{calls}  429s {rejected}  errors {len(self.errors) - errors_before}")
+        return result
+
+    def run(self):
+        args = self.args
+        print(f"workers {self.workers}")
+        if args.scrape:
+            articles = self.stage(
+                'scrape', lambda: scrape_articles(args, self.workers, self.path('scrape')))
+        else:
+            articles = synthetic_articles(args.articles, args.seed)
+
+        translator = ArticleTranslator(
+            cache=TranslationCache(self.path('translations.sqlite3')),
+            on_error=self.errors.append,
+            make_translator=self.translation)
+        translator.batcher.max_workers = self.workers
+        texts = [text for article in articles for text in (article['title'], article['summary'])]
+        self.stage('translate', lambda: [translator.translate_batch(texts, code)
+                                         for code in LanguageConfig.pretranslate_codes()])
+
+        tts = TextToSpeech(None, cache=AudioCache(self.path('article_audio')),
+                           client=self.openai, on_error=self.errors.append)
+
+        def article_audio():
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                return list(pool.map(
+                    lambda article: tts.generate_audio(
+                        article['summary'], 'english', voice_seed=article['text_hash']),
+                    articles))
+        self.stage('article audio', article_audio)
+
+        full = self.generator('full')
+        self.stage('podcast', lambda: full.create_podcast(articles))
+
+        incremental = self.generator('incremental')
+        self.stage('incremental podcast',
+                   lambda: incremental.create_podcast(articles, incremental=True))
+        changed = articles[:-1] + synthetic_articles(1, seed=args.seed + 1)
+        self.stage('  after 1 new story',
+                   lambda: incremental.create_podcast(changed, incremental=True))
+
+    def close(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--articles', type=int, default=7)
+    parser.add_argument('--scrape', action='store_true',
+                        help='scrape the articles from the fixture server first')
+    parser.add_argument('--http-latency', type=float, default=0.05)
+    parser.add_argument('--chat-latency', type=float, default=1.0)
+    parser.add_argument('--tts-latency', type=float, default=0.4)
+    parser.add_argument('--tts-seconds-per-char', type=float, default=0.001)
+    parser.add_argument('--translate-latency', type=float, default=0.3)
+    parser.add_argument('--rate-limit', type=int,
+                        help='concurrent requests per fake OpenAI endpoint before 429s')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    for workers in args.workers:
+        pipeline = PipelineRun(args, workers)
+        try:
+            pipeline.run()
+        finally:
+            pipeline.close()
+    tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark the scrape pipeline offline against the local fixture server.
+
+    python benchmarks/bench_scrape.py --refreshes 10 --latency 0.08 --error-rate 0.02
+    python benchmarks/bench_scrape.py --fixtures benchmarks/fixtures --slow-rate 0.1
+    python benchmarks/bench_scrape.py --modes cold --stories 60 --extract-workers 4
+
+Runs NewsContentScraper with the podcast app's settings against the
+fixture server (see fixture_server.py), from empty caches ("cold") and
+with caches primed by an earlier refresh ("warm"). Reports articles/sec,
+p50/p95 refresh latency, the traced peak memory of one more refresh and
+the requests and connections the server saw. With --extract-workers,
+articles are parsed in a warmed ExtractionPool instead of on the scraper
+threads (its memory isn't in the traced peak). Bundle the NLTK data first
+(python nltk_setup.py) so no refresh downloads it.
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_server import (ServerProcess, add_fault_arguments, fault_options,  # noqa: E402
+                            load_fixtures, synthetic_fixtures)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class ScrapeBench:
+    """Scrapers pointed at the fixture server, each with its own cache directory."""
+
+    def __init__(self, server, sites, args):
+        from news_scraper import PODCAST_PROFILE
+        from extraction_pool import ExtractionPool
+
+        self.server = server
+        self.args = args
+        # Shared by every scraper, and warmed before anything is timed
+        self.pool = ExtractionPool(args.extract_workers) if args.extract_workers else None
+        if self.pool is not None:
+            self.pool.warm()
+        self.profile = dict(
+            PODCAST_PROFILE,
+            sources={source_name: dict(site['config'], url=server.urls[source_name])
+                     for source_name, site in sites.items()},
+            max_workers=args.workers,
+            max_per_host=args.max_per_host,
+            extraction_pool=self.pool,
+            request_interval=(PODCAST_PROFILE['request_interval']
+                              if args.request_interval is None else args.request_interval)
+        )
+        self.errors = []
+        self.workdir = tempfile.mkdtemp(prefix='bench_scrape_')
+        self._scrapers = []
+
+    def new_scraper(self):
+        from news_scraper import NewsContentScraper
+
+        cache_dir = os.path.join(self.workdir, str(len(self._scrapers)))
+        scraper = NewsContentScraper(
+            **self.profile,
+            cache_dir=os.path.join(cache_dir, 'http'),
+            article_db=os.path.join(cache_dir, 'articles.sqlite3'),
+            on_error=self.errors.append
+        )
+        self._scrapers.append(scraper)
+        return scraper
+
+    def refresh(self, scraper):
+        return len(scraper.scrape_news(total_articles=self.args.articles))
+
+    def run(self, mode):
+        scraper = self.new_scraper()
+        if mode == 'warm':
+            self.refresh(scraper)
+
+        errors_before = len(self.errors)
+        served_before = self.server.stats()
+        times = []
+        articles = 0
+        for _ in range(self.args.refreshes):
+            if mode == 'cold':
+                scraper = self.new_scraper()
+            start = time.perf_counter()
+            articles += self.refresh(scraper)
+            times.append(time.perf_counter() - start)
+        served = self.server.stats()
+        served = {name: served.get(name, 0) - served_before.get(name, 0) for name in served}
+        errors = len(self.errors) - errors_before
+
+        if mode == 'cold':
+            scraper = self.new_scraper()
+        tracemalloc.start()
+        self.refresh(scraper)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{mode:<5} {articles / len(times):5.1f} articles/refresh  "
+              f"{articles / sum(times):6.2f} articles/s  "
+              f"p50 {percentile(times, 0.5):6.3f}s  p95 {percentile(times, 0.95):6.3f}s  "
+              f"peak {peak / 2**20:6.1f} MiB")
+        print(f"      server: {served.get('requests', 0)} requests over "
+              f"{served.get('connections', 0)} connections, "
+              f"{served.get('not_modified', 0)} not modified, "
+              f"{served.get('errors', 0)} injected errors, "
+              f"{served.get('slow', 0)} slow bodies; scraper errors: {errors}")
+
+    def close(self):
+        for scraper in self._scrapers:
+            scraper.http.close()
+            scraper.article_store.close()
+        if self.pool is not None:
+            self.pool.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', help='recorded fixtures (default: synthetic sites)')
+    parser.add_argument('--stories', type=int, default=20,
+                        help='articles per synthetic source')
+    parser.add_argument('--page-kb', type=int, default=100, help='synthetic page size')
+    parser.add_argument('--modes', nargs='+', choices=('cold', 'warm'), default=['cold', 'warm'])
+    parser.add_argument('--refreshes', type=int, default=5)
+    parser.add_argument('--articles', type=int, default=7, help='articles per refresh')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--max-per-host', type=int, default=2)
+    parser.add_argument('--extract-workers', type=int, default=0,
+                        help='worker processes for article extraction (0: scraper threads)')
+    parser.add_argument('--request-interval', type=float,
+                        help="per-host spacing of request starts (default: the podcast app's)")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        from nltk_setup import ensure_punkt
+
+        ensure_punkt()
+        if args.fixtures:
+            sites = load_fixtures(args.fixtures)
+        else:
+            sites = synthetic_fixtures(articles_per_source=args.stories,
+                                       page_kb=args.page_kb, seed=args.seed)
+    except ImportError as e:
+        print(f"skipped: {e}")
+        return
+
+    random.seed(args.seed)  # the podcast profile shuffles sources and links
+    with ServerProcess(sites, **fault_options(args)) as server:
+        bench = ScrapeBench(server, sites, args)
+        try:
+            for mode in args.modes:
+                bench.run(mode)
+        finally:
+            bench.close()
+
+
+if __name__ == '__main__':
+    main()
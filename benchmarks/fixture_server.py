@@ -0,0 +1,374 @@
+"""
+Local HTTP server that replays news sites for offline scrape benchmarks.
+
+    python benchmarks/fixture_server.py record benchmarks/fixtures
+    python benchmarks/fixture_server.py serve benchmarks/fixtures --latency 0.1
+
+`record` saves each podcast source's homepage and the articles it links
+to, plus a manifest.json. `serve` (and bench_scrape.py) replays them with
+injected latency, errors and slow bodies. Each source gets its own port,
+so per-host throttling and connection pooling work the way they do
+against the live sites. Without a fixture directory a synthetic site is
+generated instead.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STATS_PATH = '/__stats'
+SLOW_CHUNKS = 10
+
+SYLLABLES = ('ka', 'lo', 'min', 'ne', 'so', 'ta', 'ri', 'ver', 'lake', 'north',
+             'port', 'dale', 'wood', 'ton', 'ber', 'ash', 'el', 'mar', 'sun', 'field')
+
+
+def path_of(url):
+    parts = urlsplit(url)
+    return (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+
+def record_fixtures(out_dir, links_per_source=30):
+    """Save the podcast sources' homepages and linked articles under `out_dir`."""
+    from news_scraper import NewsContentScraper, PODCAST_PROFILE, PODCAST_SOURCES
+
+    workdir = tempfile.mkdtemp(prefix='record_fixtures_')
+    scraper = NewsContentScraper(**dict(PODCAST_PROFILE, max_links=links_per_source),
+                                 cache_dir=os.path.join(workdir, 'http'),
+                                 article_db=os.path.join(workdir, 'articles.sqlite3'))
+    manifest = {}
+    for index, (source_name, config) in enumerate(PODCAST_SOURCES.items()):
+        site_dir = os.path.join(out_dir, f'site{index}')
+        os.makedirs(site_dir, exist_ok=True)
+        home = path_of(config['url'])
+        pages = {}
+        origins = {f"{urlsplit(config['url']).scheme}://{urlsplit(config['url']).netloc}"}
+        for number, url in enumerate([config['url']] + scraper.get_links(source_name)):
+            try:
+                response = scraper.http.get(url)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Skipping {url}: {str(e)}")
+                continue
+            filename = f'site{index}/{number}.html'
+            with open(os.path.join(out_dir, filename), 'wb') as f:
+                f.write(response.content)
+            pages[path_of(url)] = filename
+            origins.add(f"{urlsplit(url).scheme}://{urlsplit(url).netloc}")
+        manifest[source_name] = {
+            'config': {key: value for key, value in config.items() if key != 'url'},
+            'home': home,
+            'origins': sorted(origins),
+            'pages': pages
+        }
+        print(f"{source_name}: {len(pages)} pages")
+
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+
+def load_fixtures(fixture_dir):
+    """Recorded sites: source name -> config, home path, origins and page bodies."""
+    with open(os.path.join(fixture_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    sites = {}
+    for source_name, site in manifest.items():
+        pages = {}
+        for path, filename in site['pages'].items():
+            with open(os.path.join(fixture_dir, filename), 'rb') as f:
+                pages[path] = f.read()
+        sites[source_name] = dict(site, pages=pages)
+    return sites
+
+
+def synthetic_fixtures(sources=None, articles_per_source=20, page_kb=100, seed=0):
+    """
+    Generated sites shaped like the podcast sources: a homepage whose story
+    links match every source's selector, and article pages with a title,
+    byline, date and a few paragraphs of distinct pseudo-words, padded with
+    navigation markup to about `page_kb` KiB.
+    """
+    if sources is None:
+        from news_scraper import PODCAST_SOURCES as sources
+
+    rng = random.Random(seed)
+
+    def word():
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+
+    def sentence(length):
+        return ' '.join(word() for _ in range(length)).capitalize() + '.'
+
+    padding = ''.join(f'<li><a href="/section/{n}">Section {n}</a></li>'
+                      for n in range(page_kb * 1024 // 48))
+
+    sites = {}
+    for source_name, config in sources.items():
+        pages = {}
+        links = []
+        for number in range(articles_per_source):
+            title = sentence(8)[:-1]
+            path = f'/story/{number}-{title.lower().replace(" ", "-")[:40]}'
+            paragraphs = ''.join(
+                f"<p>{' '.join(sentence(rng.randint(12, 20)) for _ in range(4))}</p>"
+                for _ in range(6))
+            pages[path] = f'''<!DOCTYPE html>
+<html><head><title>{title}</title>
+<meta property="article:published_time" content="2026-01-{number % 28 + 1:02d}T08:00:00Z">
+<meta name="author" content="{word().capitalize()} {word().capitalize()}">
+</head><body><nav><ul>{padding}</ul></nav>
+<article><h1>{title}</h1>{paragraphs}</article>
+</body></html>'''.encode('utf-8')
+            links.append(f'<div class="article story"><h3>'
+                         f'<a class="article-link" href="{path}">{title}</a></h3></div>')
+        pages['/'] = (f'<!DOCTYPE html><html><head><title>{source_name}</title></head>'
+                      f'<body><nav><ul>{padding}</ul></nav>{"".join(links)}</body></html>'
+                      ).encode('utf-8')
+        sites[source_name] = {
+            'config': {key: value for key, value in config.items() if key != 'url'},
+            'home': '/',
+            'origins': [],
+            'pages': pages
+        }
+    return sites
+
+
+class Faults:
+    """Injected latency, error responses and slowly dripped bodies."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 slow_rate=0.0, slow_body=1.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_rate = slow_rate
+        self.slow_body = slow_body
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def delay(self):
+        """Seconds to wait before the response starts."""
+        return max(0.0, self.latency + (self._random() * 2 - 1) * self.jitter)
+
+    def error(self):
+        return self._random() < self.error_rate
+
+    def slow(self):
+        """Seconds to spread the body over, 0 to send it at once."""
+        return self.slow_body if self._random() < self.slow_rate else 0
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so client pooling shows up
+    counted = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        owner = self.server.owner
+        if self.path == STATS_PATH:
+            return self._send(200, json.dumps(owner.stats()).encode(), 'application/json')
+
+        if not self.counted:  # one handler per connection
+            self.counted = True
+            owner.count('connections')
+        owner.count('requests')
+        time.sleep(owner.faults.delay())
+        if owner.faults.error():
+            owner.count('errors')
+            return self._send(owner.faults.error_status, b'injected error')
+
+        page = self.server.pages.get(self.path)
+        if page is None:
+            owner.count('not_found')
+            return self._send(404, b'not found')
+        body, etag = page
+        if self.headers.get('If-None-Match') == etag:
+            owner.count('not_modified')
+            return self._send(304, b'', etag=etag)
+
+        drip = owner.faults.slow()
+        if drip:
+            owner.count('slow')
+        self._send(200, body, 'text/html; charset=utf-8', etag=etag, drip=drip)
+
+    def _send(self, status, body, content_type='text/plain', etag=None, drip=0):
+        self.send_response(status)
+        if status != 304:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if status == 304:
+            return
+
+        if drip:
+            chunk_size = max(1, -(-len(body) // SLOW_CHUNKS))
+            for start in range(0, len(body), chunk_size):
+                self.wfile.write(body[start:start + chunk_size])
+                self.wfile.flush()
+                time.sleep(drip / SLOW_CHUNKS)
+        else:
+            self.wfile.write(body)
+        self.server.owner.count('bytes', len(body))
+
+
+class FixtureServer:
+    """Serve each site on its own 127.0.0.1 port, counting what clients do."""
+
+    def __init__(self, sites, faults=None):
+        self.sites = sites
+        self.faults = faults or Faults()
+        self.urls = {}
+        self.stats_url = None
+        self._servers = []
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def start(self):
+        for source_name, site in self.sites.items():
+            server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+            server.daemon_threads = True
+            server.owner = self
+            origin = f'http://127.0.0.1:{server.server_port}'
+            server.pages = {}
+            for path, body in site['pages'].items():
+                # Absolute links to the recorded site point back here
+                for recorded_origin in site['origins']:
+                    body = body.replace(recorded_origin.encode(), origin.encode())
+                etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+                server.pages[path] = (body, etag)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+            self.urls[source_name] = origin + site['home']
+            self.stats_url = self.stats_url or origin + STATS_PATH
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+
+def _serve(sites, fault_options, conn):
+    server = FixtureServer(sites, Faults(**fault_options)).start()
+    conn.send((server.urls, server.stats_url))
+    threading.Event().wait()
+
+
+class ServerProcess:
+    """
+    A FixtureServer in a child process, so serving doesn't compete with the
+    benchmarked scraper for the GIL. Stats are read over HTTP.
+    """
+
+    def __init__(self, sites, **fault_options):
+        self.sites = sites
+        self.fault_options = fault_options
+        self.urls = {}
+        self.stats_url = None
+        self._process = None
+
+    def start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.sites, self.fault_options, child_conn), daemon=True)
+        self._process.start()
+        self.urls, self.stats_url = parent_conn.recv()
+        return self
+
+    def stats(self):
+        with urlopen(self.stats_url) as response:
+            return json.load(response)
+
+    def stop(self):
+        self._process.terminate()
+        self._process.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_fault_arguments(parser):
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='seconds before each response starts')
+    parser.add_argument('--jitter', type=float, default=0.02,
+                        help='latency varies by up to +/- this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of requests answered with --error-status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--slow-rate', type=float, default=0.0,
+                        help='fraction of bodies dripped out over --slow-body seconds')
+    parser.add_argument('--slow-body', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def fault_options(args):
+    return {
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'error_rate': args.error_rate,
+        'error_status': args.error_status,
+        'slow_rate': args.slow_rate,
+        'slow_body': args.slow_body,
+        'seed': args.seed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help='save the live sites as fixtures')
+    record.add_argument('fixtures')
+    record.add_argument('--links', type=int, default=30, help='articles per source')
+    serve = commands.add_parser('serve', help='replay fixtures until interrupted')
+    serve.add_argument('fixtures', nargs='?', help='recorded fixtures (default: synthetic)')
+    add_fault_arguments(serve)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_fixtures(args.fixtures, links_per_source=args.links)
+        return
+
+    sites = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(seed=args.seed)
+    server = FixtureServer(sites, Faults(**fault_options(args))).start()
+    for source_name, url in server.urls.items():
+        print(f"{source_name:<14} {url}")
+    print(f"{'stats':<14} {server.stats_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+from metrics import count
+
+
+class HostThrottle:
+    """Cap in-flight requests and space out request starts per host."""
+
+    def __init__(self, min_interval=0.5, max_per_host=2):
+        self.min_interval = min_interval
+        self.max_per_host = max_per_host
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def acquire(self, url):
+        host = self.host_of(url)
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(
+                    self.max_per_host)
+            slot = self._slots[host]
+        slot.acquire()
+
+        # Reserve the next start time for this host, then wait for it
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+        return host
+
+    def release(self, host):
+        self._slots[host].release()
+
+    @contextmanager
+    def limit(self, url):
+        host = self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+
+def streamlit_thread_initializer():
+    """
+    Return a pool initializer that lets worker threads use st.* calls
+    (st.error etc.) for the current script run, or None outside Streamlit.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except ImportError:
+        return None
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+
+    def attach():
+        add_script_run_ctx(threading.current_thread(), ctx)
+    return attach
+
+
+class ConcurrentScraper:
+    """
+    Run link discovery and article scraping for all sources in parallel.
+    Each job holds its host's `throttle` slot; pass None when the jobs'
+    HTTP client throttles its own network requests. Jobs that raise are
+    reported through `on_error(message)`.
+    """
+
+    def __init__(self, throttle, max_workers=8, initializer=None, on_error=print):
+        self.throttle = throttle
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.on_error = on_error
+
+    def _limited(self, url, func, arg):
+        if self.throttle is None:
+            return func(arg)
+        with self.throttle.limit(url):
+            return func(arg)
+
+    def run(self, sources, get_links, scrape_article, accept, total, per_source=None):
+        """
+        Scrape up to `total` articles from `sources` (name -> homepage url).
+
+        `get_links(name)` returns candidate URLs for a source and
+        `scrape_article(url)` returns article data or None. Results are handed
+        to `accept(name, article_data)` on the calling thread, which returns
+        True if the article was kept. A source never has more than
+        `per_source` articles kept or in flight, and outstanding work is
+        cancelled as soon as `total` articles have been accepted.
+        """
+        cap = per_source or total
+        kept = {name: 0 for name in sources}
+        queued = {}
+        seen_urls = set()
+        in_flight = {}
+        accepted = 0
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                  initializer=self.initializer)
+        try:
+            for name, url in sources.items():
+                future = pool.submit(self._limited, url, get_links, name)
+                in_flight[future] = (name, None)
+
+            while in_flight and accepted < total:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, link = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        count('errors', stage='scrape', source=name)
+                        self.on_error(f"Error fetching {link or sources[name]}: {str(e)}")
+                        result = None
+
+                    if link is None:
+                        queued[name] = list(result or [])
+                    elif (result and accepted < total and kept[name] < cap
+                          and accept(name, result)):
+                        kept[name] += 1
+                        accepted += 1
+
+                self._top_up(pool, queued, kept, cap, seen_urls,
+                             in_flight, scrape_article)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return accepted
+
+    def _top_up(self, pool, queued, kept, cap, seen_urls, in_flight, scrape_article):
+        """Round-robin new article jobs across sources until the pool is busy."""
+        busy = {}
+        for name, link in in_flight.values():
+            if link is not None:
+                busy[name] = busy.get(name, 0) + 1
+
+        submitted = True
+        while submitted and sum(busy.values()) < self.max_workers:
+            submitted = False
+            for name, links in queued.items():
+                if kept[name] + busy.get(name, 0) >= cap:
+                    continue
+                while links and links[0] in seen_urls:
+                    links.pop(0)
+                if not links:
+                    continue
+
+                link = links.pop(0)
+                seen_urls.add(link)
+                future = pool.submit(self._limited, link, scrape_article, link)
+                in_flight[future] = (name, link)
+                busy[name] = busy.get(name, 0) + 1
+                submitted = True
+                if sum(busy.values()) >= self.max_workers:
+                    break
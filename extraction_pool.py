@@ -0,0 +1,172 @@
+"""
+Article extraction (newspaper's parse() and nlp()) in worker processes.
+
+Both steps are pure-Python and CPU-bound, so scraper threads take turns
+on the GIL while extracting. An ExtractionPool ships the downloaded HTML
+to processes instead and gets compact article records back, so large
+refreshes and backfills scale with cores.
+
+Workers are spawned rather than forked (the apps are multi-threaded) and
+warmed once on start: punkt and the stopword lists are loaded by
+extracting a sample page, so the first real article doesn't pay for it.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from multiprocessing import get_context
+from urllib.parse import urlsplit
+from metrics import metrics, span, count
+from nltk_setup import ensure_punkt
+
+SAMPLE_URL = 'https://example.com/news/2026/01/15/sample-story'
+SAMPLE_HTML = '''<!DOCTYPE html>
+<html><head><title>City council approves new transit plan</title>
+<meta property="article:published_time" content="2026-01-15T08:00:00Z">
+<meta name="author" content="Jane Doe"></head>
+<body><article><h1>City council approves new transit plan</h1>
+<p>The city council voted on Tuesday to approve a new transit plan that adds
+three bus lines and extends light rail service into the northern suburbs.
+Supporters said the plan would cut commute times for thousands of riders.</p>
+<p>Opponents raised concerns about the cost of the project, which is expected
+to exceed two hundred million dollars over the next decade. The mayor said
+federal grants would cover a large share of the construction budget.</p>
+<p>Construction on the first bus line is scheduled to begin in the spring.
+Residents can comment on the proposed routes at public meetings next month.</p>
+</article></body></html>'''
+
+
+def article_record(article):
+    """The fields the scraper keeps from a parsed newspaper Article."""
+    return {
+        'title': article.title,
+        'summary': article.summary,
+        'text': article.text,
+        'authors': article.authors,
+        'date': article.publish_date.strftime('%Y-%m-%d') if article.publish_date else "Unknown"
+    }
+
+
+def extract_in_worker(url, html):
+    """Parse and summarize a page; returns (record, parse seconds, nlp seconds)."""
+    from newspaper import Article
+
+    article = Article(url)
+    article.download(input_html=html)
+    start = time.perf_counter()
+    article.parse()
+    parsed = time.perf_counter()
+    ensure_punkt()
+    article.nlp()
+    return article_record(article), parsed - start, time.perf_counter() - parsed
+
+
+def _warm_worker():
+    try:
+        from newspaper import nlp
+
+        # nlp() rereads the stopword file into a module-level set on every
+        # call; loading each language once leaves the same set behind
+        load_stopwords = getattr(nlp, 'load_stopwords', None)
+        if load_stopwords is not None and not hasattr(load_stopwords, 'cache_info'):
+            nlp.load_stopwords = lru_cache(maxsize=None)(load_stopwords)
+        extract_in_worker(SAMPLE_URL, SAMPLE_HTML)
+    except Exception:
+        # A worker that can't warm up still starts; its first real
+        # extraction raises the actual error to the caller
+        pass
+
+
+def _worker_pid(hold):
+    # Holding the worker briefly makes the next task go to another one
+    time.sleep(hold)
+    return os.getpid()
+
+
+class ExtractionPool:
+    """
+    A process pool for extract_in_worker, started on first use. `workers`
+    defaults to the number of cores. A pool whose worker died is restarted
+    on the next extraction.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=get_context('spawn'),
+                    initializer=_warm_worker)
+            return self._executor
+
+    def warm(self, rounds=10):
+        """Start and warm every worker now; returns their process ids."""
+        executor = self.executor()
+        pids = set()
+        try:
+            for _ in range(rounds):
+                futures = [executor.submit(_worker_pid, 0.1) for _ in range(self.workers)]
+                pids.update(future.result() for future in futures)
+                if len(pids) >= self.workers:
+                    break
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        return pids
+
+    def extract(self, url, html):
+        """Article record for an already downloaded page, as extracted by a worker."""
+        host = urlsplit(url).netloc
+        executor = self.executor()
+        try:
+            # Covers queueing and the round trip as well as the work itself
+            with span('article_extract', host=host):
+                record, parse_seconds, nlp_seconds = executor.submit(
+                    extract_in_worker, url, html).result()
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        metrics.observe('article_parse', parse_seconds, host=host)
+        metrics.observe('article_nlp', nlp_seconds, host=host)
+        return record
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                count('extraction_pool_restarts')
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def extraction_pool(workers=None):
+    """
+    Process-wide ExtractionPool, started (and warmed in the background) on
+    first call. Without `workers` it only runs when
+    MINNEDIGEST_EXTRACT_WORKERS is set; returns None then, and articles are
+    extracted on the scraper's own threads.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = workers or os.environ.get('MINNEDIGEST_EXTRACT_WORKERS')
+            if not workers:
+                return None
+            _pool = ExtractionPool(int(workers))
+            threading.Thread(target=_pool.warm, daemon=True, name='extraction-warmup').start()
+        return _pool
@@ -0,0 +1,207 @@
+"""
+Local stand-ins for OpenAI and Google Translate, for load tests and
+benchmarks. They answer deterministically after a configurable delay:
+scripts in the [Sarah]/[Mike] format built from the prompt's articles,
+MP3 speech of plausible length (silent, but valid frames), and
+translations that keep the input's line layout.
+
+Select them with MINNEDIGEST_SERVICES=fake (see services.py).
+"""
+import os
+import re
+import threading
+import time
+from types import SimpleNamespace
+from fingerprint import content_fingerprint
+from mp3_assembly import build_header, parse_header
+
+# Roughly how fast TTS voices speak
+CHARS_PER_SECOND = 15
+SPEECH_BITRATE = 64000
+
+STORY_PATTERN = re.compile(r'Article from (.+?):\s*\n\s*Title: (.+?)\s*\n\s*Summary: (.*)')
+
+
+class FakeRateLimitError(Exception):
+    """Shaped like openai.RateLimitError, so api_retry treats it the same way."""
+
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__("Rate limit reached (fake service)")
+        self.response = SimpleNamespace(headers={'retry-after-ms': str(int(retry_after * 1000))})
+
+
+class Endpoint:
+    """Simulated latency and concurrency limit of one API endpoint, with call counts."""
+
+    def __init__(self, latency, max_concurrency=None, retry_after=0.2):
+        self.latency = latency
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rejected = 0
+
+    def enter(self):
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise FakeRateLimitError(self.retry_after)
+        with self._lock:
+            self.calls += 1
+
+    def leave(self):
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {'calls': self.calls, 'rejected': self.rejected}
+
+
+def speech_mp3(seconds):
+    """Valid MP3 frames of `seconds` length in the tts-1 output format."""
+    header_bytes = build_header(bitrate=SPEECH_BITRATE)
+    header = parse_header(header_bytes + b'\x00' * 4)
+    frame = header_bytes + b'\x00' * (header.frame_length - 4)
+    return frame * max(1, round(seconds * header.sample_rate / header.samples))
+
+
+def fake_script(messages):
+    """A deterministic two-host script for a (full or partial) episode prompt."""
+    prompt = messages[-1]['content']
+    stories = STORY_PATTERN.findall(prompt)
+    lines = []
+    if not stories and 'sign-off' in prompt and 'opening' not in prompt:
+        lines.append("[Sarah] That's all for today. Thanks for listening, see you tomorrow!")
+    elif not stories or 'Start with a welcome' in prompt or 'opening' in prompt:
+        lines.append("[Sarah] Welcome to MinneDigest, your daily Minnesota news podcast!")
+        lines.append("[Mike] Great to be here. Let's get into today's stories.")
+    for source, title, summary in stories:
+        lines.append(f"[Sarah] Next up, from {source}: {title}.")
+        lines.append(f"[Mike] Here's the gist. {summary}")
+        lines.append(f"[Sarah] Thanks, Mike. Reference {content_fingerprint(title)[:8]}.")
+    if stories and 'Start with a welcome' in prompt:
+        lines.append("[Sarah] That's all for today. Thanks for listening, see you tomorrow!")
+    return '\n'.join(lines)
+
+
+class FakeChatCompletions:
+    def __init__(self, endpoint, chunk_chars=24, chunk_interval=0.02):
+        self.endpoint = endpoint
+        self.chunk_chars = chunk_chars
+        self.chunk_interval = chunk_interval
+
+    def create(self, model, messages, temperature=None, stream=False, **kwargs):
+        self.endpoint.enter()
+        try:
+            time.sleep(self.endpoint.latency)
+            script = fake_script(messages)
+        finally:
+            if not stream:
+                self.endpoint.leave()
+        if stream:
+            return self._stream(script)
+        return SimpleNamespace(choices=[
+            SimpleNamespace(message=SimpleNamespace(role='assistant', content=script))])
+
+    def _stream(self, script):
+        try:
+            for start in range(0, len(script), self.chunk_chars):
+                time.sleep(self.chunk_interval)
+                yield SimpleNamespace(choices=[SimpleNamespace(
+                    delta=SimpleNamespace(content=script[start:start + self.chunk_chars]))])
+        finally:
+            self.endpoint.leave()
+
+
+class FakeSpeechResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def read(self):
+        return self.content
+
+    def stream_to_file(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.content)
+
+
+class FakeSpeech:
+    def __init__(self, endpoint, seconds_per_char=0.0):
+        self.endpoint = endpoint
+        # Real TTS takes longer for longer input
+        self.seconds_per_char = seconds_per_char
+
+    def create(self, model, voice, input, response_format="mp3", **kwargs):
+        if response_format != "mp3":
+            raise ValueError(f"The fake TTS only produces mp3, not {response_format}")
+        self.endpoint.enter()
+        try:
+            time.sleep(self.endpoint.latency + self.seconds_per_char * len(input))
+            return FakeSpeechResponse(speech_mp3(len(input) / CHARS_PER_SECOND))
+        finally:
+            self.endpoint.leave()
+
+
+class FakeOpenAI:
+    """
+    Covers the calls the apps make: chat.completions.create (plain or
+    streamed) and audio.speech.create. `max_concurrency` caps in-flight
+    requests per endpoint; requests over the cap get a 429 with
+    Retry-After, like a real rate limit.
+    """
+
+    def __init__(self, chat_latency=1.0, chunk_interval=0.02, tts_latency=0.4,
+                 tts_seconds_per_char=0.001, max_concurrency=None):
+        self.chat_endpoint = Endpoint(chat_latency, max_concurrency)
+        self.tts_endpoint = Endpoint(tts_latency, max_concurrency)
+        self.chat = SimpleNamespace(completions=FakeChatCompletions(
+            self.chat_endpoint, chunk_interval=chunk_interval))
+        self.audio = SimpleNamespace(speech=FakeSpeech(
+            self.tts_endpoint, seconds_per_char=tts_seconds_per_char))
+
+    @classmethod
+    def from_env(cls):
+        """Defaults scaled by MINNEDIGEST_FAKE_LATENCY (0 answers instantly)."""
+        scale = float(os.environ.get('MINNEDIGEST_FAKE_LATENCY', 1))
+        return cls(chat_latency=1.0 * scale, chunk_interval=0.02 * scale,
+                   tts_latency=0.4 * scale, tts_seconds_per_char=0.001 * scale)
+
+    def stats(self):
+        return {'chat': self.chat_endpoint.stats(), 'tts': self.tts_endpoint.stats()}
+
+
+class FakeTranslator:
+    """Drop-in for deep_translator's GoogleTranslator(source, target).translate."""
+
+    def __init__(self, target, endpoint):
+        self.target = target
+        self.endpoint = endpoint
+
+    def translate(self, text):
+        self.endpoint.enter()
+        try:
+            time.sleep(self.endpoint.latency)
+            return '\n'.join(f"[{self.target}] {line}" if line.strip() else line
+                             for line in text.split('\n'))
+        finally:
+            self.endpoint.leave()
+
+
+class FakeTranslationService:
+    """Factory for FakeTranslators sharing one endpoint (latency, limit, counts)."""
+
+    def __init__(self, latency=0.3, max_concurrency=None):
+        self.endpoint = Endpoint(latency, max_concurrency)
+
+    @classmethod
+    def from_env(cls):
+        return cls(latency=0.3 * float(os.environ.get('MINNEDIGEST_FAKE_LATENCY', 1)))
+
+    def __call__(self, target_lang):
+        return FakeTranslator(target_lang, self.endpoint)
+
+    def stats(self):
+        return self.endpoint.stats()
@@ -0,0 +1,66 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class FeedStore:
+    """
+    SQLite hand-off between the prefetch daemon and the apps: the latest
+    scrape of each source and the composed feeds, stored as JSON. WAL mode
+    lets the UI read while the daemon writes, so a refresh is one SELECT.
+    """
+
+    def __init__(self, db_path='.cache/feeds.sqlite3'):
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS source_articles (
+                    source TEXT PRIMARY KEY,
+                    articles TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )''')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS feeds (
+                    name TEXT PRIMARY KEY,
+                    articles TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )''')
+
+    def put_source(self, source, articles):
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO source_articles VALUES (?, ?, ?)',
+                (source, json.dumps(articles), time.time()))
+
+    def source_articles(self):
+        """Latest articles per source: {source name: [article, ...]}."""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT source, articles FROM source_articles').fetchall()
+        return {source: json.loads(articles) for source, articles in rows}
+
+    def put_feed(self, name, articles):
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO feeds VALUES (?, ?, ?)',
+                (name, json.dumps(articles), time.time()))
+
+    def get_feed(self, name, max_age=None):
+        """Return (articles, updated_at) for a feed, or None if missing or stale."""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT articles, updated_at FROM feeds WHERE name = ?', (name,)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0]), row[1]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,28 @@
+import hashlib
+import re
+import unicodedata
+
+# Separates parts so ("ab", "c") and ("a", "bc") fingerprint differently
+PART_SEPARATOR = '\x1f'
+
+
+def normalize_text(text):
+    """Unicode NFC with whitespace runs collapsed; case is kept."""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text or '')).strip()
+
+
+def content_fingerprint(*parts):
+    """
+    Stable 128-bit BLAKE2b hex digest of the normalized text parts.
+
+    Unlike the built-in hash() this is identical across processes and
+    machines, so it can key on-disk caches (articles, translations, audio).
+    """
+    text = PART_SEPARATOR.join(normalize_text(part) for part in parts)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def bytes_fingerprint(data):
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
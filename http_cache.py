@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class HttpCache:
+    """
+    On-disk cache of response bodies plus their ETag/Last-Modified
+    validators. Each URL is stored as <key>.body with a <key>.json sidecar.
+
+    Entries not used for `max_age_days` are dropped and the directory is
+    kept under `max_bytes` by evicting least recently used entries (by
+    sidecar mtime), on start and every 100 stores.
+    """
+
+    def __init__(self, cache_dir='.cache/http', max_age_days=7, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._stores = 0
+        self.hits = 0          # fresh copy served without touching the network
+        self.revalidated = 0   # 304 Not Modified, body served from disk
+        self.misses = 0        # full download
+        self.prune()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _write(self, path, data):
+        # Write then rename so concurrent readers never see a partial file
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return entry
+
+    def is_fresh(self, entry, ttl):
+        return bool(ttl) and time.time() - entry['fetched_at'] < ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read_body(self, url):
+        meta_path, body_path = self._paths(url)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        try:
+            os.utime(meta_path)  # mark as recently used
+        except OSError:
+            pass
+        return body
+
+    def store(self, url, response, encoding):
+        meta_path, body_path = self._paths(url)
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': encoding,
+            'fetched_at': time.time()
+        }
+        self._write(body_path, response.content)
+        self._write(meta_path, json.dumps(entry).encode('utf-8'))
+        with self._lock:
+            self._stores += 1
+            prune_due = self._stores % 100 == 0
+        if prune_due:
+            self.prune()
+        return entry
+
+    def refresh(self, url, entry, response):
+        """Record a 304: keep the stored body, update validators and age."""
+        entry = dict(entry)
+        entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+        entry['last_modified'] = response.headers.get(
+            'Last-Modified', entry.get('last_modified'))
+        entry['fetched_at'] = time.time()
+        self._write(self._paths(url)[0], json.dumps(entry).encode('utf-8'))
+        return entry
+
+    def _entries(self):
+        """key -> [last used, total bytes] of the stored entries."""
+        entries = {}
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if name.endswith('.tmp'):
+                # Left behind by a crashed write; recent ones may still be in progress
+                if stat.st_mtime < time.time() - 3600:
+                    self._unlink(path)
+                continue
+            entry = entries.setdefault(name.split('.', 1)[0], [0.0, 0])
+            entry[0] = max(entry[0], stat.st_mtime)
+            entry[1] += stat.st_size
+        return entries
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Apply the retention policy: age limit first, then size cap."""
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size in entries.values())
+            for key, (used_at, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+                if used_at >= cutoff and total <= self.max_bytes:
+                    break
+                base = os.path.join(self.cache_dir, key)
+                self._unlink(base + '.json')
+                self._unlink(base + '.body')
+                total -= size
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self):
+        with self._lock:
+            requests_seen = self.hits + self.revalidated + self.misses
+            return {
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.revalidated) / requests_seen if requests_seen else 0.0
+            }
@@ -0,0 +1,272 @@
+"""
+Fast extraction of the links a source's CSS selectors pick out of a
+homepage, without building a BeautifulSoup tree.
+
+A source's comma-separated selectors are compiled once and evaluated
+together in a single pass, only for elements that carry an href. Two
+engines run the pass:
+
+- 'lxml': libxml2 parses the page in C (lxml is installed with
+  newspaper), then an XPath picks the href elements.
+- 'html.parser': the standard library tokenizer streams the page, keeping
+  only the stack of open ancestors.
+
+Supported selector syntax is what the source configs use: tag, .class,
+#id and [attr], [attr=v], [attr*=v], [attr^=v], [attr$=v], [attr~=v],
+[attr|=v], joined by descendant (space) or child (>) combinators.
+Anything else falls back to BeautifulSoup's select().
+"""
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+
+try:
+    import lxml.html
+    DEFAULT_ENGINE = 'lxml'
+except ImportError:
+    DEFAULT_ENGINE = 'html.parser'
+
+# Elements that never have children, so never go on the ancestor stack
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'))
+
+_TOKEN = re.compile(r'''
+    (?P<tag>^(?:\*|[a-zA-Z][\w-]*))
+  | \.(?P<cls>[\w-]+)
+  | \#(?P<id>[\w-]+)
+  | \[\s*(?P<attr>[\w:-]+)\s*
+      (?:(?P<op>[*^$~|]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+''', re.VERBOSE)
+
+
+class Compound:
+    """One simple-selector sequence, e.g. a.article-link[href*="/story/"]."""
+
+    def __init__(self, text):
+        self.tag = None
+        self.classes = []
+        self.attrs = []  # (name, op, value); op None means presence only
+        position = 0
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"Unsupported selector: {text!r}")
+            if match.group('tag'):
+                if match.group('tag') != '*':
+                    self.tag = match.group('tag').lower()
+            elif match.group('cls'):
+                self.classes.append(match.group('cls'))
+            elif match.group('id'):
+                self.attrs.append(('id', '=', match.group('id')))
+            else:
+                value = match.group('value')
+                if value and value[0] in '"\'':
+                    value = value[1:-1]
+                self.attrs.append((match.group('attr').lower(), match.group('op'), value))
+            position = match.end()
+
+    def matches(self, tag, attrs):
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.classes:
+            classes = (attrs.get('class') or '').split()
+            if not all(name in classes for name in self.classes):
+                return False
+        for name, op, value in self.attrs:
+            actual = attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=':
+                ok = actual == value
+            elif op == '*=':
+                ok = bool(value) and value in actual
+            elif op == '^=':
+                ok = bool(value) and actual.startswith(value)
+            elif op == '$=':
+                ok = bool(value) and actual.endswith(value)
+            elif op == '~=':
+                ok = value in actual.split()
+            else:  # |=
+                ok = actual == value or actual.startswith(value + '-')
+            if not ok:
+                return False
+        return True
+
+
+class Selector:
+    """A chain of compounds; matched right to left against the ancestors."""
+
+    def __init__(self, text):
+        self.compounds = []
+        self.combinators = []  # combinators[i] joins compounds[i] and compounds[i + 1]
+        combinator = None
+        for token in split_tokens(text):
+            if token == '>':
+                if not self.compounds or combinator == '>':
+                    raise ValueError(f"Unsupported selector: {text!r}")
+                combinator = '>'
+                continue
+            if self.compounds:
+                self.combinators.append(combinator or ' ')
+            self.compounds.append(Compound(token))
+            combinator = None
+        if not self.compounds or combinator:
+            raise ValueError(f"Unsupported selector: {text!r}")
+
+    def matches(self, tag, attrs, ancestors):
+        """`ancestors` lists (tag, attrs) of the open elements, nearest first."""
+        if not self.compounds[-1].matches(tag, attrs):
+            return False
+        return self._match_up(len(self.compounds) - 2, ancestors, 0)
+
+    def _match_up(self, index, ancestors, position):
+        if index < 0:
+            return True
+        compound = self.compounds[index]
+        if self.combinators[index] == '>':
+            candidates = range(position, min(position + 1, len(ancestors)))
+        else:
+            candidates = range(position, len(ancestors))
+        for i in candidates:
+            tag, attrs = ancestors[i]
+            if compound.matches(tag, attrs) and self._match_up(index - 1, ancestors, i + 1):
+                return True
+        return False
+
+
+def split_tokens(text):
+    """Split a selector on whitespace and '>', leaving [attr="a b"] intact."""
+    tokens, current, quote, depth = [], '', None, 0
+    for char in text.strip():
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '"\'' and depth:
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif not depth and (char.isspace() or char == '>'):
+            if current:
+                tokens.append(current)
+                current = ''
+            if char == '>':
+                tokens.append('>')
+            continue
+        current += char
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+class SelectorGroup:
+    """Comma-separated selectors, any of which may match."""
+
+    def __init__(self, text):
+        self.text = text
+        self.selectors = [Selector(part) for part in text.split(',') if part.strip()]
+
+    def matches(self, tag, attrs, ancestors):
+        return any(selector.matches(tag, attrs, ancestors) for selector in self.selectors)
+
+
+@lru_cache(maxsize=64)
+def compile_selectors(text):
+    return SelectorGroup(text)
+
+
+class _AnchorParser(HTMLParser):
+    def __init__(self, group):
+        super().__init__(convert_charrefs=True)
+        self.group = group
+        self.stack = []
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or '' for name, value in attrs}
+        href = attrs.get('href')
+        if href and self.group.matches(tag, attrs, self.stack[::-1]):
+            self.hrefs.append(href)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append((tag, attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        # <a href=... /> has no children; don't leave it on the stack
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        # Close the nearest open element of this name (and anything left
+        # unclosed inside it); stray end tags are ignored
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                del self.stack[index:]
+                return
+
+
+def _decode(content, encoding):
+    if isinstance(content, str):
+        return content
+    return content.decode(encoding or 'utf-8', errors='replace')
+
+
+def links_with_html_parser(content, group, encoding=None):
+    parser = _AnchorParser(group)
+    parser.feed(_decode(content, encoding))
+    parser.close()
+    return parser.hrefs
+
+
+def links_with_lxml(content, group, encoding=None):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+        encoding = 'utf-8'
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    try:
+        root = lxml.html.document_fromstring(content, parser=parser)
+    except lxml.etree.ParserError:  # empty document
+        return []
+    hrefs = []
+    for element in root.xpath('//*[@href]'):
+        href = element.get('href')
+        ancestors = [(parent.tag, parent.attrib) for parent in element.iterancestors()]
+        if href and group.matches(element.tag, element.attrib, ancestors):
+            hrefs.append(href)
+    return hrefs
+
+
+def links_with_soup(content, selector_text):
+    """The original path: a full BeautifulSoup tree and one select() per selector."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    hrefs = []
+    for selector in selector_text.split(','):
+        for link in soup.select(selector.strip()):
+            href = link.get('href')
+            if href:
+                hrefs.append(href)
+    return hrefs
+
+
+ENGINES = {
+    'lxml': links_with_lxml,
+    'html.parser': links_with_html_parser,
+}
+
+
+def extract_links(content, selector_text, encoding=None, engine=None):
+    """
+    hrefs of the elements matching any of the comma-separated selectors,
+    in document order. Selectors this module can't compile are run
+    through BeautifulSoup instead (grouped by selector, as select() does).
+    """
+    try:
+        group = compile_selectors(selector_text)
+    except ValueError:
+        return links_with_soup(content, selector_text)
+    return ENGINES[engine or DEFAULT_ENGINE](content, group, encoding)
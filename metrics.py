@@ -0,0 +1,189 @@
+"""
+Process-wide timings and counters for the digest pipeline.
+
+    with span('article_parse', host=host):
+        article.parse()
+    count('http_bytes', len(body), host=host)
+
+Spans keep a count, total and maximum per (name, labels); counters keep a
+running total. Everything is exported as Prometheus text (served on
+MINNEDIGEST_METRICS_PORT, see metrics_server), as JSON lines appended to
+MINNEDIGEST_METRICS_LOG (one per finished span), and as a snapshot for
+the Streamlit diagnostics panel.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = 'minnedigest'
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe registry of span timings and counters."""
+
+    def __init__(self, log_path=None):
+        self._lock = threading.Lock()
+        self._spans = {}     # (name, labels) -> [count, total seconds, max seconds]
+        self._counters = {}  # (name, labels) -> total
+        self.log_path = log_path
+        self.started_at = time.time()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                stats = self._spans[key] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+        if self.log_path:
+            self._log({'ts': time.time(), 'span': name, 'seconds': round(seconds, 6),
+                       **labels})
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the block; failures are timed too and counted as `errors`."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.count('errors', stage=name, **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of span()."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _log(self, record):
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+
+    def snapshot(self):
+        """Spans and counters as lists of dicts, slowest spans first."""
+        with self._lock:
+            spans = [dict(labels, span=name, count=stats[0], total=stats[1],
+                          mean=stats[1] / stats[0], max=stats[2])
+                     for (name, labels), stats in self._spans.items()]
+            counters = [dict(labels, counter=name, value=value)
+                        for (name, labels), value in self._counters.items()]
+        spans.sort(key=lambda row: row['total'], reverse=True)
+        counters.sort(key=lambda row: row['counter'])
+        return {'spans': spans, 'counters': counters}
+
+    def prometheus_text(self):
+        with self._lock:
+            spans = sorted(self._spans.items())
+            counters = sorted(self._counters.items())
+
+        lines = [f'# TYPE {PREFIX}_span_seconds summary']
+        for (name, labels), (span_count, total, _) in spans:
+            label_text = _format_labels(labels, [('span', name)])
+            lines.append(f'{PREFIX}_span_seconds_count{label_text} {span_count}')
+            lines.append(f'{PREFIX}_span_seconds_sum{label_text} {total:.6f}')
+        lines.append(f'# TYPE {PREFIX}_span_seconds_max gauge')
+        for (name, labels), (_, _, longest) in spans:
+            lines.append(f'{PREFIX}_span_seconds_max'
+                         f'{_format_labels(labels, [("span", name)])} {longest:.6f}')
+
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f'{PREFIX}_{name}_total'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+
+metrics = Metrics(log_path=os.environ.get('MINNEDIGEST_METRICS_LOG'))
+span = metrics.span
+timed = metrics.timed
+count = metrics.count
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = metrics.prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    """Prometheus scrape endpoint at http://<host>:<port>/metrics."""
+
+    def __init__(self, host='127.0.0.1', port=9464):
+        self.httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}/metrics"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True,
+                         name='metrics').start()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def metrics_server(port=None):
+    """
+    Process-wide metrics endpoint, started on first call. Without a `port`
+    it only runs when MINNEDIGEST_METRICS_PORT is set; returns None then.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            port = port or os.environ.get('MINNEDIGEST_METRICS_PORT')
+            if not port:
+                return None
+            _server = MetricsServer(
+                host=os.environ.get('MINNEDIGEST_METRICS_HOST', '127.0.0.1'), port=int(port))
+        return _server
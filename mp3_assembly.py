@@ -0,0 +1,170 @@
+from collections import namedtuple
+from functools import lru_cache
+
+BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    2.5: [11025, 12000, 8000],
+}
+VERSION_BITS = {0b11: 1, 0b10: 2, 0b00: 2.5}
+
+FrameHeader = namedtuple(
+    'FrameHeader',
+    'version bitrate sample_rate channels protected frame_length samples side_info_length')
+
+
+def parse_header(data, offset=0):
+    """Parse an MPEG Layer III frame header at `offset`, or return None."""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = VERSION_BITS.get((b1 >> 3) & 0b11)
+    if version is None or (b1 >> 1) & 0b11 != 0b01:  # Layer III only
+        return None
+
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0b11
+    if bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = BITRATES[1 if version == 1 else 2][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    channels = 1 if (b3 >> 6) == 0b11 else 2
+
+    coefficient = 144 if version == 1 else 72
+    if version == 1:
+        side_info_length = 17 if channels == 1 else 32
+    else:
+        side_info_length = 9 if channels == 1 else 17
+    return FrameHeader(
+        version=version,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        channels=channels,
+        protected=not (b1 & 1),
+        frame_length=coefficient * bitrate // sample_rate + padding,
+        samples=1152 if version == 1 else 576,
+        side_info_length=side_info_length
+    )
+
+
+def skip_id3v2(data):
+    if len(data) >= 10 and data[:3] == b'ID3':
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def is_info_frame(data, offset, header):
+    """Xing/Info/VBRI frames describe the whole file and are wrong once concatenated."""
+    tag_offset = offset + 4 + (2 if header.protected else 0) + header.side_info_length
+    return (data[tag_offset:tag_offset + 4] in (b'Xing', b'Info')
+            or data[offset + 36:offset + 40] == b'VBRI')
+
+
+def iter_frames(data):
+    """Yield (offset, header) for every audio frame, skipping tags and junk."""
+    offset = skip_id3v2(data)
+    first = True
+    while offset + 4 <= len(data):
+        header = parse_header(data, offset)
+        if header is None or offset + header.frame_length > len(data):
+            if data[offset:offset + 3] == b'TAG':  # trailing ID3v1
+                return
+            offset += 1  # resync
+            continue
+        if not (first and is_info_frame(data, offset, header)):
+            yield offset, header
+        first = False
+        offset += header.frame_length
+
+
+def audio_format(header):
+    return (header.version, header.sample_rate, header.channels)
+
+
+def mp3_frames(data):
+    """Return (bare audio frames, format) for an MP3 file's bytes."""
+    frames = []
+    fmt = None
+    for offset, header in iter_frames(data):
+        fmt = fmt or audio_format(header)
+        frames.append(data[offset:offset + header.frame_length])
+    return b''.join(frames), fmt
+
+
+def build_header(version=2, bitrate=64000, sample_rate=24000, channels=1):
+    """Four header bytes for an unprotected, unpadded Layer III frame."""
+    version_bits = {v: bits for bits, v in VERSION_BITS.items()}[version]
+    bitrate_index = BITRATES[1 if version == 1 else 2].index(bitrate // 1000)
+    rate_index = SAMPLE_RATES[version].index(sample_rate)
+    channel_mode = 0b11 if channels == 1 else 0b00
+    return bytes([
+        0xFF,
+        0xE0 | (version_bits << 3) | (0b01 << 1) | 1,
+        (bitrate_index << 4) | (rate_index << 2),
+        channel_mode << 6
+    ])
+
+
+@lru_cache(maxsize=32)
+def silence_frames(fmt, seconds):
+    """
+    Pre-rendered silence: frames whose side info and main data are all
+    zero decode to digital silence, so no encoder is needed.
+    """
+    version, sample_rate, channels = fmt
+    bitrate = BITRATES[1 if version == 1 else 2][1] * 1000  # lowest bitrate, smallest frames
+    header_bytes = build_header(version, bitrate, sample_rate, channels)
+    header = parse_header(header_bytes + b'\x00' * 4)
+    frame = header_bytes + b'\x00' * (header.frame_length - 4)
+    count = round(seconds * sample_rate / header.samples)
+    return frame * count
+
+
+class Mp3Assembler:
+    """
+    Concatenate MP3 segments into one file frame by frame: no decode, no
+    re-encode, and only one segment in memory at a time. All segments must
+    share a format (MPEG version, sample rate, channels), which holds for
+    one TTS model asked for mp3; a mismatch raises ValueError.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.format = None
+        self._file = open(output_path, 'wb')
+
+    def add(self, mp3_bytes):
+        frames, fmt = mp3_frames(mp3_bytes)
+        if fmt is None:
+            return
+        if self.format is None:
+            self.format = fmt
+        elif fmt != self.format:
+            raise ValueError(f"Segment format {fmt} differs from episode format {self.format}")
+        self._file.write(frames)
+
+    def add_file(self, path):
+        with open(path, 'rb') as f:
+            self.add(f.read())
+
+    def add_silence(self, seconds):
+        if self.format is not None and seconds > 0:
+            self._file.write(silence_frames(self.format, seconds))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
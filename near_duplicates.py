@@ -0,0 +1,102 @@
+import hashlib
+import random
+import re
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_text(text):
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+def shingles(text, size=5):
+    """Character n-grams of the normalized text."""
+    text = normalize_text(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def stable_hash(value):
+    # Built-in hash() is salted per process; signatures must be comparable
+    # across runs so the index can be persisted or rebuilt
+    return int.from_bytes(
+        hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index over title + summary shingles.
+
+    Insert and query cost depends on the article's own length, not on how
+    many articles are already indexed, so the index can span a multi-day
+    history. Articles whose estimated Jaccard similarity reaches
+    `threshold` are duplicates, which catches the same wire story
+    syndicated by several outlets under slightly different headlines.
+    """
+
+    def __init__(self, threshold=0.6, num_perm=128, bands=32, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._urls = {}
+        self._titles = {}
+        self._last_signature = (None, None)
+
+    def signature(self, text):
+        # find() followed by add() for the same article is the common path
+        if self._last_signature[0] == text:
+            return self._last_signature[1]
+        hashes = [stable_hash(shingle) for shingle in shingles(text)] or [0]
+        signature = tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+        self._last_signature = (text, signature)
+        return signature
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def similarity(self, sig_a, sig_b):
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+    def find(self, url, title, summary=''):
+        """Return the key of an indexed duplicate, or None."""
+        if url in self._urls:
+            return self._urls[url]
+        title_key = normalize_text(title)
+        if title_key in self._titles:
+            return self._titles[title_key]
+
+        signature = self.signature(f"{title} {summary}")
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+
+        best_key, best_score = None, self.threshold
+        for key in candidates:
+            score = self.similarity(signature, self._signatures[key])
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def add(self, key, url, title, summary=''):
+        signature = self.signature(f"{title} {summary}")
+        self._signatures[key] = signature
+        self._urls[url] = key
+        self._titles[normalize_text(title)] = key
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def __len__(self):
+        return len(self._signatures)
@@ -0,0 +1,358 @@
+import csv
+import json
+import random
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+from http_session import HttpClient
+from http_cache import HttpCache
+from article_store import ArticleStore
+from fingerprint import content_fingerprint
+from near_duplicates import NearDuplicateIndex
+from concurrent_fetch import ConcurrentScraper, HostThrottle
+from link_extraction import extract_links
+from extraction_pool import article_record
+from nltk_setup import ensure_punkt
+from metrics import span, timed, count
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Source sets used by the front-ends. Each source needs a homepage 'url' and
+# an 'article_link_selector' (comma-separated selectors are allowed).
+# Optional: 'priority' (lower is scraped first, default 1) and 'cache_ttl'
+# (seconds the homepage is served from cache, overriding the scraper default).
+MPR_SOURCES = {
+    'MPR News': {
+        'url': 'https://www.mprnews.org',
+        'article_link_selector': 'a[href*="/story/"]'
+    }
+}
+
+CORE_SOURCES = dict(MPR_SOURCES, **{
+    'MinnPost': {
+        'url': 'https://www.minnpost.com',
+        'article_link_selector': 'h3.entry-title a'
+    }
+})
+
+FEED_SOURCES = dict(CORE_SOURCES, **{
+    'Star Tribune': {
+        'url': 'https://www.startribune.com',
+        'article_link_selector': 'a.article-link'
+    },
+    'KSTP': {
+        'url': 'https://kstp.com/news',
+        'article_link_selector': 'h3.article-title a'
+    },
+    'Fox 9': {
+        'url': 'https://www.fox9.com/news',
+        'article_link_selector': 'article.story a'
+    }
+})
+
+PODCAST_SOURCES = {
+    'MPR News': {
+        'url': 'https://www.mprnews.org',
+        'article_link_selector': 'a[href*="/story/"]',
+        'priority': 1
+    },
+    'Star Tribune': {
+        'url': 'https://www.startribune.com',
+        'article_link_selector': '.article-link, .article-preview a',
+        'priority': 1
+    },
+    'Fox 9': {
+        'url': 'https://www.fox9.com/news',
+        'article_link_selector': '.article a, .story a',
+        'priority': 2,
+        'cache_ttl': 300
+    }
+}
+
+# Links on section pages that point at actual stories
+ARTICLE_URL_PATTERNS = ('/story/', '/article/', '/news/')
+
+# Unwanted text newspaper leaves in summaries
+BOILERPLATE_PATTERNS = (
+    "Subscribe today", "Support local journalism",
+    "Read more:", "Related:", "Advertisement"
+)
+
+# The podcast app's scraper settings, shared with the prefetch daemon so
+# both build the same feed
+PODCAST_PROFILE = {
+    'sources': PODCAST_SOURCES,
+    'request_interval': 0.5,
+    'url_patterns': ARTICLE_URL_PATTERNS,
+    'max_links': 10,
+    'min_summary_length': 50,
+    'boilerplate': BOILERPLATE_PATTERNS,
+    'dedup_threshold': 0.6,
+    'shuffle': True,
+    'balance_sources': True
+}
+PODCAST_FEED = 'podcast'
+
+
+class NewsContentScraper:
+    """
+    The scraping engine behind every front-end: concurrent, per-host
+    throttled fetching over one pooled and cached HTTP client, with parsed
+    articles kept in the ArticleStore.
+
+    Front-ends differ only in configuration:
+    - `url_patterns` keeps links containing one of the patterns, and
+      `max_links` caps the links taken per source.
+    - `min_summary_length` drops stories with no title or a short summary,
+      and `boilerplate` strings are removed from summaries.
+    - `dedup_threshold` turns on near-duplicate filtering across sources.
+    - `shuffle` randomizes source order within a priority, each source's
+      links and the final feed; `balance_sources` caps every source at its
+      share of the total.
+    - `on_error(message)` reports failures (print, st.error, ...), and
+      `thread_initializer()` is called per scrape to build the worker
+      initializer (e.g. streamlit_thread_initializer).
+    - `extraction_pool` (an ExtractionPool) moves parse() and nlp() into
+      worker processes; without one they run on the scraper's threads.
+    """
+
+    def __init__(self, sources=None, max_workers=8, request_interval=1, max_per_host=2,
+                 cache_dir='.cache/http', homepage_cache_ttl=60, article_cache_ttl=3600,
+                 article_db='.cache/articles.sqlite3', url_patterns=None, max_links=None,
+                 min_summary_length=0, boilerplate=(), dedup_threshold=None,
+                 shuffle=False, balance_sources=False, on_error=print,
+                 thread_initializer=None, extraction_pool=None):
+        self.sources = sources if sources is not None else CORE_SOURCES
+        self.max_workers = max_workers
+        self.url_patterns = url_patterns
+        self.max_links = max_links
+        self.min_summary_length = min_summary_length
+        self.boilerplate = boilerplate
+        # Estimated Jaccard similarity at which two stories count as the same
+        self.dedup_threshold = dedup_threshold
+        self.shuffle = shuffle
+        self.balance_sources = balance_sources
+        self.on_error = on_error
+        self.thread_initializer = thread_initializer
+        self.extraction_pool = extraction_pool
+        # Politeness limits apply per host, so different sources run in parallel
+        self.throttle = HostThrottle(
+            min_interval=request_interval, max_per_host=max_per_host)
+        self.headers = HEADERS
+        # Seconds a cached copy is served without revalidating; sources can
+        # override the homepage value with a 'cache_ttl' entry
+        self.homepage_cache_ttl = homepage_cache_ttl
+        self.article_cache_ttl = article_cache_ttl
+        # Pooled keep-alive session shared by homepage and article fetches;
+        # only requests that go to the network take a host slot
+        self.http = HttpClient(self.headers, pool_maxsize=max_per_host,
+                               cache=HttpCache(cache_dir), throttle=self.throttle)
+        # Parsed articles by URL, so parse() and nlp() only run on new stories
+        self.article_store = ArticleStore(article_db)
+
+    def is_duplicate(self, new_article, seen_index):
+        """
+        Check if an article is a duplicate of one already in `seen_index`,
+        by URL, title or near-identical title and summary
+        """
+        if not new_article:
+            return True
+
+        with span('dedup'):
+            return seen_index.find(
+                new_article['url'], new_article['title'], new_article['summary']) is not None
+
+    def get_links(self, source_name):
+        """Article URLs linked from a source's homepage, in page order."""
+        source_config = self.sources[source_name]
+        links = {}  # Ordered and free of duplicate URLs
+        try:
+            content, encoding = self.http.fetch(
+                source_config['url'],
+                ttl=source_config.get('cache_ttl', self.homepage_cache_ttl))
+            with span('link_extract', source=source_name):
+                for href in extract_links(
+                        content, source_config['article_link_selector'], encoding):
+                    # Handle relative URLs
+                    full_url = urljoin(source_config['url'], href)
+                    if self.url_patterns and not any(
+                            pattern in full_url for pattern in self.url_patterns):
+                        continue
+                    links[full_url] = None
+
+            count('links_found', len(links), source=source_name)
+            return list(links)[:self.max_links]
+        except Exception as e:
+            count('errors', stage='get_links', source=source_name)
+            self.on_error(f"Error getting links from {source_name}: {str(e)}")
+            return []
+
+    def fetch_article_html(self, url):
+        with span('article_download', host=urlsplit(url).netloc):
+            return self.http.get_html(url, ttl=self.article_cache_ttl)
+
+    def extract_article(self, url, html):
+        """Run newspaper's parse and NLP over an already downloaded page."""
+        if self.extraction_pool is not None:
+            return self.extraction_pool.extract(url, html)
+
+        from newspaper import Article
+
+        host = urlsplit(url).netloc
+        article = Article(url)
+        # Hand over the pooled download so newspaper doesn't fetch again
+        article.download(input_html=html)
+        with span('article_parse', host=host):
+            article.parse()
+        ensure_punkt()  # nlp() splits sentences with punkt
+        with span('article_nlp', host=host):
+            article.nlp()
+        return article_record(article)
+
+    def scrape_article(self, url):
+        try:
+            # Known stories come back from the store without reparsing
+            article = self.article_store.load(
+                url, self.fetch_article_html, self.extract_article)
+
+            if self.min_summary_length and (
+                    not article['title'] or not article['summary']
+                    or len(article['summary']) < self.min_summary_length):
+                count('articles_rejected', reason='short_summary', host=urlsplit(url).netloc)
+                return None
+
+            summary = article['summary']
+            for pattern in self.boilerplate:
+                summary = summary.replace(pattern, "")
+            summary = summary.strip()
+
+            return {
+                'url': url,
+                'title': article['title'],
+                'summary': summary,
+                'text': article['text'],
+                'authors': article['authors'],
+                'date': article['date'],
+                'timestamp': datetime.now().isoformat(),
+                # Stable across runs, keys the translation and audio caches
+                'text_hash': content_fingerprint(article['title'], summary)
+            }
+        except Exception as e:
+            count('errors', stage='scrape_article', host=urlsplit(url).netloc)
+            self.on_error(f"Error scraping article {url}: {str(e)}")
+            return None
+
+    def ordered_sources(self, source_names=None):
+        """Source name -> homepage URL, lower priority numbers first."""
+        priority_groups = {}
+        for source_name, config in self.sources.items():
+            if source_names is None or source_name in source_names:
+                priority_groups.setdefault(config.get('priority', 1), []).append(source_name)
+
+        ordered = {}
+        for priority in sorted(priority_groups):
+            group = priority_groups[priority]
+            if self.shuffle:
+                random.shuffle(group)
+            for source_name in group:
+                ordered[source_name] = self.sources[source_name]['url']
+        return ordered
+
+    def _accept_into(self, new_articles):
+        """Selection rule shared by scrape_news and compose_feed."""
+        seen_index = None
+        if self.dedup_threshold is not None:
+            seen_index = NearDuplicateIndex(threshold=self.dedup_threshold)
+
+        def accept(source_name, article_data):
+            if seen_index is not None:
+                if self.is_duplicate(article_data, seen_index):
+                    count('articles_rejected', reason='duplicate', source=source_name)
+                    return False
+                seen_index.add(len(new_articles), article_data['url'],
+                               article_data['title'], article_data['summary'])
+            article_data['source'] = source_name
+            self.article_store.set_source(article_data['url'], source_name)
+            count('articles_accepted', source=source_name)
+            new_articles.append(article_data)
+            return True
+
+        return accept
+
+    def per_source_quota(self, total_articles, source_count):
+        if not self.balance_sources or source_count == 0:
+            return None
+        # At least 1 article per source
+        return max(1, total_articles // source_count)
+
+    @timed('scrape_news')
+    def scrape_news(self, total_articles=5, source_names=None):
+        """Scrape a feed of `total_articles`, optionally from some sources only."""
+        new_articles = []
+        accept = self._accept_into(new_articles)
+        sources = self.ordered_sources(source_names)
+        if not sources:
+            return []
+
+        def get_links(source_name):
+            links = self.get_links(source_name)
+            if self.shuffle:
+                random.shuffle(links)
+            return links
+
+        engine = ConcurrentScraper(
+            None,  # self.http throttles its own network requests
+            max_workers=self.max_workers,
+            initializer=self.thread_initializer() if self.thread_initializer else None,
+            on_error=self.on_error
+        )
+        engine.run(sources, get_links, self.scrape_article, accept, total_articles,
+                   per_source=self.per_source_quota(total_articles, len(sources)))
+
+        if self.shuffle:
+            random.shuffle(new_articles)  # Final shuffle for variety
+        return new_articles[:total_articles]
+
+    def compose_feed(self, articles_by_source, total_articles=5):
+        """
+        Build a feed from already scraped articles (source name -> list)
+        with the same priority order, quota, dedup and shuffle as a live
+        scrape_news.
+        """
+        new_articles = []
+        accept = self._accept_into(new_articles)
+        sources = self.ordered_sources(articles_by_source)
+        if not sources:
+            return []
+        cap = self.per_source_quota(total_articles, len(sources)) or total_articles
+        for source_name in sources:
+            kept = 0
+            for article in articles_by_source[source_name]:
+                if kept >= cap or len(new_articles) >= total_articles:
+                    break
+                if accept(source_name, dict(article)):
+                    kept += 1
+
+        if self.shuffle:
+            random.shuffle(new_articles)
+        return new_articles
+
+
+def save_json(articles, filename):
+    with open(filename, 'w') as f:
+        json.dump(articles, f, indent=4)
+
+
+def save_csv(articles, filename):
+    fieldnames = []
+    for article in articles:
+        fieldnames.extend(key for key in article if key not in fieldnames)
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for article in articles:
+            row = dict(article)
+            if isinstance(row.get('authors'), list):
+                row['authors'] = ', '.join(row['authors'])
+            writer.writerow(row)
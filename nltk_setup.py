@@ -0,0 +1,99 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+# Searched before NLTK's defaults: $NLTK_DATA, data bundled next to the app,
+# then the local cache that on-demand downloads go to
+BUNDLED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
+CACHE_DATA_DIR = os.path.join('.cache', 'nltk_data')
+
+# newspaper's nlp() loads the pickled punkt model; NLTK >= 3.8.2's
+# sent_tokenize loads punkt_tab
+PUNKT_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+}
+
+# After a failed download (e.g. offline), wait this long before trying again
+RETRY_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+_checked = False
+_retry_at = 0
+_warned = False
+_lock = threading.Lock()
+
+
+def data_dirs():
+    dirs = [os.environ.get('NLTK_DATA'), BUNDLED_DATA_DIR, CACHE_DATA_DIR]
+    return [d for d in dirs if d]
+
+
+def missing_resources():
+    import nltk
+
+    for data_dir in reversed(data_dirs()):
+        if data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, data_dir)
+    missing = []
+    for name, resource in PUNKT_RESOURCES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def _needed(missing):
+    # punkt_tab doesn't exist for NLTK releases older than 3.8.2, which
+    # don't load it either
+    if 'punkt_tab' in missing:
+        from nltk.tokenize import punkt
+
+        if not hasattr(punkt, 'PunktTokenizer'):
+            missing = [name for name in missing if name != 'punkt_tab']
+    return missing
+
+
+def ensure_punkt(download=True):
+    """
+    Make the punkt sentence tokenizer loadable, checking the local data
+    paths once per process. Only missing data is downloaded (into
+    .cache/nltk_data), so warm starts never touch the network. Call it
+    right before tokenizing, not at import. If the data is still missing
+    afterwards (e.g. offline), a call after RETRY_SECONDS tries again.
+    """
+    global _checked, _retry_at, _warned
+    if _checked or time.monotonic() < _retry_at:
+        return
+    with _lock:
+        if _checked or time.monotonic() < _retry_at:
+            return
+        missing = _needed(missing_resources())
+        if missing and download:
+            import nltk
+
+            os.makedirs(CACHE_DATA_DIR, exist_ok=True)
+            for name in missing:
+                nltk.download(name, download_dir=CACHE_DATA_DIR, quiet=True)
+            missing = _needed(missing_resources())
+        if not missing:
+            _checked = True
+            return
+        _retry_at = time.monotonic() + RETRY_SECONDS
+        if not _warned:
+            _warned = True
+            logger.warning("NLTK data missing: %s; sentence tokenizing will fail "
+                           "until it is downloaded (python nltk_setup.py)", ', '.join(missing))
+
+
+if __name__ == '__main__':
+    # Deploy step: python nltk_setup.py [target dir] bundles the data ahead of time
+    target = sys.argv[1] if len(sys.argv) > 1 else BUNDLED_DATA_DIR
+    import nltk
+
+    for name in PUNKT_RESOURCES:
+        nltk.download(name, download_dir=target)
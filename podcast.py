@@ -1,262 +1,19 @@
-import json
-from pydub import AudioSegment
 import streamlit as st
-import time
-from openai import OpenAI
-import random
-import nltk
-from newspaper import Article
-from bs4 import BeautifulSoup
-import requests
 import os
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from deep_translator import GoogleTranslator
-
-# Download required NLTK data
-nltk.download('punkt')
-
-
-class LanguageConfig:
-    SUPPORTED_LANGUAGES = {
-        'english': {'code': 'en', 'voice_options': ['coral', 'onyx', 'nova', 'sage']},
-        'spanish': {'code': 'es', 'voice_options': ['alloy', 'echo', 'fable', 'onyx']},
-        'french': {'code': 'fr', 'voice_options': ['alloy', 'echo', 'nova', 'shimmer']},
-        'german': {'code': 'de', 'voice_options': ['onyx', 'nova', 'fable', 'echo']},
-        'hindi': {'code': 'hi', 'voice_options': ['alloy', 'echo', 'nova']},
-        'tamil': {'code': 'ta', 'voice_options': ['alloy', 'echo', 'nova']},
-        'russian': {'code': 'ru', 'voice_options': ['alloy', 'echo', 'fable', 'nova']},
-        'italian': {'code': 'it', 'voice_options': ['alloy', 'echo', 'shimmer', 'nova']},
-        'japanese': {'code': 'ja', 'voice_options': ['alloy', 'echo', 'nova']},
-        'chinese-simplified': {'code': 'ny', 'voice_options': ['alloy', 'echo', 'fable']},
-        'chinese': {'code': 'zh-CN', 'voice_options': ['alloy', 'echo', 'fable']}
-
-    }
-
-
-class ArticleTranslator:
-    def __init__(self):
-        self.translators = {}
-
-    def get_translator(self, target_lang):
-        if target_lang not in self.translators:
-            self.translators[target_lang] = GoogleTranslator(
-                source='en', target=target_lang)
-        return self.translators[target_lang]
-
-    def translate_text(self, text, target_lang):
-        try:
-            if target_lang == 'en':  # Skip translation for English
-                return text
-
-            # Split long text into chunks if needed (GoogleTranslator has a limit)
-            max_chunk_size = 4500
-            if len(text) > max_chunk_size:
-                chunks = [text[i:i + max_chunk_size]
-                          for i in range(0, len(text), max_chunk_size)]
-                translated_chunks = []
-                for chunk in chunks:
-                    translator = self.get_translator(target_lang)
-                    translated_chunks.append(translator.translate(chunk))
-                return ' '.join(translated_chunks)
-            else:
-                translator = self.get_translator(target_lang)
-                return translator.translate(text)
-        except Exception as e:
-            st.error(f"Translation error: {str(e)}")
-            return text
-
-
-class NewsContentScraper:
-    def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        # Updated source configurations with more specific selectors
-        self.sources = {
-            'MPR News': {
-                'url': 'https://www.mprnews.org',
-                'article_link_selector': 'a[href*="/story/"]',
-                'priority': 1
-            },
-            'Star Tribune': {
-                'url': 'https://www.startribune.com',
-                'article_link_selector': '.article-link, .article-preview a',
-                'priority': 1
-            },
-            'Fox 9': {
-                'url': 'https://www.fox9.com/news',
-                'article_link_selector': '.article a, .story a',
-                'priority': 2
-            }
-        }
-
-    def is_duplicate(self, new_article, existing_articles):
-        """
-        Check if an article is a duplicate based on title similarity or URL
-        """
-        if not new_article:
-            return True
-
-        # Create sets for duplicate checking
-        existing_urls = {article['url'] for article in existing_articles}
-        existing_titles = {article['title'].lower()
-                           for article in existing_articles}
-
-        # Direct URL match
-        if new_article['url'] in existing_urls:
-            return True
-
-        # Title similarity check using fuzzy matching
-        from difflib import SequenceMatcher
-
-        def similar(a, b, threshold=0.85):
-            return SequenceMatcher(None, a, b).ratio() > threshold
-
-        new_title = new_article['title'].lower()
-        for existing_title in existing_titles:
-            if similar(new_title, existing_title):
-                return True
-
-        return False
-
-    def get_links(self, source_name):
-        source_config = self.sources[source_name]
-        links = set()  # Using a set to avoid duplicate URLs
-        try:
-            response = requests.get(
-                source_config['url'],
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()  # Raise an exception for bad status codes
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            selectors = source_config['article_link_selector'].split(', ')
-
-            for selector in selectors:
-                for link in soup.select(selector):
-                    href = link.get('href')
-                    if href:
-                        # Handle relative URLs
-                        full_url = urljoin(source_config['url'], href)
-                        # Basic filtering for relevant URLs
-                        if '/story/' in full_url or '/article/' in full_url or '/news/' in full_url:
-                            links.add(full_url)
-
-            return list(links)[:10]  # Limit to top 10 links per source
-        except Exception as e:
-            st.error(f"Error getting links from {source_name}: {str(e)}")
-            return []
-
-    def scrape_article(self, url):
-        try:
-            article = Article(url)
-            article.download()
-            article.parse()
-            article.nlp()
-
-            # Enhanced content validation
-            if not article.title or not article.summary or len(article.summary) < 50:
-                return None
-
-            # Remove any unwanted text patterns (customize as needed)
-            summary = article.summary
-            unwanted_patterns = [
-                "Subscribe today", "Support local journalism",
-                "Read more:", "Related:", "Advertisement"
-            ]
-            for pattern in unwanted_patterns:
-                summary = summary.replace(pattern, "")
-
-            return {
-                'url': url,
-                'title': article.title,
-                'summary': summary.strip(),
-                'date': article.publish_date.strftime('%Y-%m-%d') if article.publish_date else "Unknown",
-                'timestamp': datetime.now().isoformat(),
-                'text_hash': hash(article.title + summary)
-            }
-        except Exception as e:
-            st.error(f"Error scraping article {url}: {str(e)}")
-            return None
-
-    def scrape_news(self, total_articles=5):
-        new_articles = []
-        seen_urls = set()
-
-        # Group sources by priority
-        priority_groups = {}
-        for source_name, config in self.sources.items():
-            priority = config['priority']
-            if priority not in priority_groups:
-                priority_groups[priority] = []
-            priority_groups[priority].append(source_name)
-
-        # Shuffle sources within each priority group
-        for priority in priority_groups:
-            random.shuffle(priority_groups[priority])
-
-        # Process sources in priority order
-        articles_per_source = total_articles // len(self.sources)
-        # At least 1 article per source
-        min_articles_per_source = max(1, articles_per_source)
-
-        for priority in sorted(priority_groups.keys()):
-            for source_name in priority_groups[priority]:
-                if len(new_articles) >= total_articles:
-                    break
-
-                with st.spinner(f"Fetching from {source_name}..."):
-                    links = self.get_links(source_name)
-                    # Randomize articles from each source
-                    random.shuffle(links)
-
-                    source_articles = 0
-                    for link in links:
-                        if link in seen_urls:
-                            continue
-
-                        if source_articles >= min_articles_per_source:
-                            break
-
-                        if len(new_articles) >= total_articles:
-                            break
-
-                        seen_urls.add(link)
-                        article_data = self.scrape_article(link)
-
-                        if article_data and not self.is_duplicate(article_data, new_articles):
-                            article_data['source'] = source_name
-                            new_articles.append(article_data)
-                            source_articles += 1
-
-                        time.sleep(0.5)  # Polite delay between requests
-
-        random.shuffle(new_articles)  # Final shuffle for variety
-        return new_articles[:total_articles]
-
-
-class TextToSpeech:
-    def __init__(self, api_key):
-        self.client = OpenAI(api_key=api_key)
-        self.language_config = LanguageConfig
-
-    def generate_audio(self, text, output_path, language):
-        try:
-            voice_options = self.language_config.SUPPORTED_LANGUAGES[language]['voice_options']
-            chosen_voice = random.choice(voice_options)
-
-            response = self.client.audio.speech.create(
-                model="tts-1",
-                voice=chosen_voice,
-                input=text
-            )
-            response.stream_to_file(output_path)
-            return True
-        except Exception as e:
-            st.error(f"Error generating audio: {str(e)}")
-            return False
+from pretranslate import FeedPreTranslator
+from audio_cache import AudioCache
+from translation import LanguageConfig, ArticleTranslator
+from speech import TextToSpeech
+from podcast_generator import PodcastGenerator
+from podcast_stream import stream_url_configured
+from concurrent_fetch import streamlit_thread_initializer
+from news_scraper import NewsContentScraper, PODCAST_PROFILE, PODCAST_FEED
+from feed_store import FeedStore
+from services import openai_client
+from metrics import metrics, metrics_server
+from extraction_pool import extraction_pool
 
 
 # def display_article(article, idx, translator, tts):
@@ -312,7 +69,7 @@ class TextToSpeech:
 
 #     st.divider()
 
-def display_article(article, idx, translator, tts):
+def display_article(article, idx, translator, tts, pretranslator=None):
     st.subheader(f"{article['source']}: {article['title']}")
     st.write(f"URL: {article['url']}")
 
@@ -332,10 +89,12 @@ def display_article(article, idx, translator, tts):
     lang_code = LanguageConfig.SUPPORTED_LANGUAGES[selected_language]['code']
 
     if selected_language != 'english':
-        translated_title = translator.translate_text(
-            article['title'], lang_code)
-        translated_summary = translator.translate_text(
-            article['summary'], lang_code)
+        texts = [article['title'], article['summary']]
+        if pretranslator:
+            # Briefly reuse the background batch if it covers this article,
+            # then translate whatever it hasn't finished in the foreground
+            pretranslator.wait(lang_code, texts)
+        translated_title, translated_summary = translator.translate_batch(texts, lang_code)
     else:
         translated_title = article['title']
         translated_summary = article['summary']
@@ -348,7 +107,7 @@ def display_article(article, idx, translator, tts):
                 st.write(article['summary'])
 
     # Generate and play audio
-    audio_key = f"audio_{idx}_{selected_language}"
+    audio_key = f"audio_{article['text_hash']}_{selected_language}"
 
     # Initialize the audio state if not already present
     if audio_key not in st.session_state:
@@ -359,8 +118,9 @@ def display_article(article, idx, translator, tts):
 
     if st.button("Generate Audio", key=f"audio_btn_{idx}"):
         with st.spinner("Generating audio..."):
-            audio_file = f"article_{selected_language}_{idx}.mp3"
-            if tts.generate_audio(translated_summary, audio_file, selected_language):
+            audio_file = tts.generate_audio(
+                translated_summary, selected_language, voice_seed=article['text_hash'])
+            if audio_file:
                 st.session_state[audio_key] = audio_file
                 # Update only the audio container
                 audio_container.audio(audio_file)
@@ -372,163 +132,6 @@ def display_article(article, idx, translator, tts):
     st.divider()
 
 
-class PodcastGenerator:
-    def __init__(self, openai_client):
-        self.client = openai_client
-        self.host_personas = {
-            "Sarah": {
-                "personality": "warm and engaging lead host, asks insightful questions",
-                "voice": "nova",
-                "pause_after": 0.5  # seconds
-            },
-            "Mike": {
-                "personality": "enthusiastic co-host with a bit of humor, provides context and analysis",
-                "voice": "onyx",
-                "pause_after": 0.5  # seconds
-            }
-        }
-
-    def generate_podcast_script(self, articles):
-        # Prepare the news content for the prompt
-        news_content = "\n\n".join([
-            f"Article from {article['source']}:\nTitle: {article['title']}\nSummary: {article['summary']}"
-            for article in articles
-        ])
-
-        # Create the prompt for the conversation
-        prompt = f"""Create a natural, engaging podcast conversation between two hosts discussing today's Minnesota news. 
-        
-        Host Personas:
-        - Sarah: {self.host_personas['Sarah']['personality']}
-        - Mike: {self.host_personas['Mike']['personality']}
-
-        Format the conversation using [Sarah] and [Mike] tags. Include reactions, questions, and natural transitions.
-        Keep each speaking segment under 30 seconds for better audio flow.
-
-        Start with a welcome and end with a sign-off.
-        Make the discussion feel natural and conversational, not just reading headlines.
-        
-        Today's News Content:
-        {news_content}"""
-
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[{
-                    "role": "system",
-                    "content": "You are a podcast script writer creating engaging conversations about news."
-                },
-                    {
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            st.error(f"Error generating podcast script: {str(e)}")
-            return None
-
-    def split_script_into_segments(self, script):
-        segments = []
-        current_speaker = None
-        current_text = []
-
-        for line in script.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check for speaker tags
-            if '[Sarah]' in line:
-                if current_speaker:
-                    segments.append({
-                        'speaker': current_speaker,
-                        'text': ' '.join(current_text)
-                    })
-                current_speaker = 'Sarah'
-                current_text = [line.replace('[Sarah]', '').strip()]
-            elif '[Mike]' in line:
-                if current_speaker:
-                    segments.append({
-                        'speaker': current_speaker,
-                        'text': ' '.join(current_text)
-                    })
-                current_speaker = 'Mike'
-                current_text = [line.replace('[Mike]', '').strip()]
-            else:
-                current_text.append(line)
-
-        # Add the last segment
-        if current_speaker and current_text:
-            segments.append({
-                'speaker': current_speaker,
-                'text': ' '.join(current_text)
-            })
-
-        return segments
-
-    def generate_audio_segment(self, text, speaker, index):
-        try:
-            output_path = f"temp_audio_{index}.mp3"
-            response = self.client.audio.speech.create(
-                model="tts-1",
-                voice=self.host_personas[speaker]['voice'],
-                input=text
-            )
-            response.stream_to_file(output_path)
-            return output_path
-        except Exception as e:
-            st.error(f"Error generating audio segment: {str(e)}")
-            return None
-
-    def create_podcast(self, articles):
-        # Generate the script
-        script = self.generate_podcast_script(articles)
-        if not script:
-            return None
-
-        # Split into segments
-        segments = self.split_script_into_segments(script)
-
-        # Generate audio for each segment
-        audio_files = []
-        for i, segment in enumerate(segments):
-            with st.spinner(f"Generating audio for {segment['speaker']}..."):
-                audio_path = self.generate_audio_segment(
-                    segment['text'],
-                    segment['speaker'],
-                    i
-                )
-                if audio_path:
-                    audio_files.append({
-                        'path': audio_path,
-                        'pause_after': self.host_personas[segment['speaker']]['pause_after']
-                    })
-
-        # Combine all audio segments
-        if audio_files:
-            final_audio = AudioSegment.empty()
-            for audio_file in audio_files:
-                segment = AudioSegment.from_mp3(audio_file['path'])
-                final_audio += segment
-
-                # Add pause between segments
-                pause = AudioSegment.silent(
-                    duration=int(audio_file['pause_after'] * 1000))
-                final_audio += pause
-
-                # Clean up temporary file
-                os.remove(audio_file['path'])
-
-            # Save final podcast
-            output_path = f"podcast_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
-            final_audio.export(output_path, format="mp3")
-            return output_path, script
-
-        return None, script
-
-
 # Set page config for a wider layout and custom theme
 st.set_page_config(
     page_title="MinneDigest",
@@ -876,6 +479,104 @@ st.markdown("""
 #     """, unsafe_allow_html=True)
 
 
+# Prefetched feeds older than this are ignored in favour of a live scrape
+FEED_MAX_AGE = 30 * 60
+
+
+# Long-lived services are built once per process and shared by every
+# session and rerun, so connection pools and in-memory caches stay warm
+@st.cache_resource(show_spinner=False)
+def get_scraper():
+    return NewsContentScraper(
+        **PODCAST_PROFILE,
+        on_error=st.error,
+        thread_initializer=streamlit_thread_initializer,
+        # Worker processes only when MINNEDIGEST_EXTRACT_WORKERS is set
+        extraction_pool=extraction_pool()
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_feed_store():
+    return FeedStore()
+
+
+@st.cache_resource(show_spinner=False)
+def get_translator():
+    return ArticleTranslator(on_error=st.error)
+
+
+@st.cache_resource(show_spinner=False)
+def get_pretranslate_pool():
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='pretranslate')
+
+
+def get_pretranslator():
+    # One per session, so a refresh only supersedes this session's own
+    # queued batches; the worker threads and translation cache are shared
+    if 'pretranslator' not in st.session_state:
+        st.session_state.pretranslator = FeedPreTranslator(
+            get_translator(), LanguageConfig.pretranslate_codes(),
+            pool=get_pretranslate_pool())
+    return st.session_state.pretranslator
+
+
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key):
+    return openai_client(api_key)
+
+
+@st.cache_resource(show_spinner=False)
+def get_audio_cache():
+    return AudioCache()
+
+
+@st.cache_resource(show_spinner=False)
+def get_tts(api_key):
+    return TextToSpeech(api_key, cache=get_audio_cache(),
+                        client=get_openai_client(api_key), on_error=st.error)
+
+
+@st.cache_resource(show_spinner=False)
+def get_podcast_generator(api_key):
+    return PodcastGenerator(
+        get_openai_client(api_key),
+        audio_cache=get_audio_cache(),
+        on_error=st.error,
+        on_status=st.caption,
+        new_progress=lambda: st.progress(0.0, text="Generating audio segments..."),
+        thread_initializer=streamlit_thread_initializer
+    )
+
+
+def play_stream(stream_url):
+    st.markdown(f"""
+        <audio controls autoplay src="{stream_url}" style="width: 100%;"></audio>
+    """, unsafe_allow_html=True)
+
+
+def show_diagnostics():
+    """Per-stage timings and counters for this server process, slowest stages first."""
+    def with_labels(row, fields):
+        labels = ', '.join(f"{key}={value}" for key, value in row.items() if key not in fields)
+        return dict({field: row[field] for field in fields}, labels=labels)
+
+    snapshot = metrics.snapshot()
+    server = metrics_server()
+    st.caption(f"Since {datetime.fromtimestamp(metrics.started_at).strftime('%H:%M:%S')}"
+               + (f" · Prometheus at {server.url}" if server else ""))
+    spans = [with_labels(row, ('span', 'count', 'total', 'mean', 'max'))
+             for row in snapshot['spans']]
+    for row in spans:
+        for field in ('total', 'mean', 'max'):
+            row[field] = round(row[field], 3)
+    st.dataframe(spans, hide_index=True)
+    st.dataframe([with_labels(row, ('counter', 'value')) for row in snapshot['counters']],
+                 hide_index=True)
+    if st.button("Reset diagnostics"):
+        metrics.reset()
+
+
 def main():
     # Header with logo and title
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -911,12 +612,10 @@ def main():
         st.session_state.selected_language = 'english'
 
     openai_api_key = os.environ.get("OPENAI_API_KEY")
+    metrics_server()  # Prometheus endpoint, when MINNEDIGEST_METRICS_PORT is set
 
-    # Initialize components
-    scraper = NewsContentScraper()
-    translator = ArticleTranslator()
-    tts = TextToSpeech(openai_api_key)
-    podcast_generator = PodcastGenerator(OpenAI(api_key=openai_api_key))
+    # Shared components (see get_scraper and friends) are fetched where
+    # they're used, so the first render doesn't wait on their imports
 
     # Sidebar logic for refreshing news
     with st.sidebar:
@@ -925,9 +624,40 @@ def main():
         """, unsafe_allow_html=True)
 
         if st.button('Refresh News Feed'):
-            with st.spinner("🌟 Gathering the latest stories..."):
-                st.session_state.articles = scraper.scrape_news(
-                    total_articles=7)
+            podcast_generator = get_podcast_generator(openai_api_key)
+            previous_articles = st.session_state.articles
+            # A feed kept warm by prefetch.py is one read; scrape live without it
+            prefetched = get_feed_store().get_feed(PODCAST_FEED, max_age=FEED_MAX_AGE)
+            cache_stats = None
+            if prefetched:
+                st.session_state.articles, updated_at = prefetched
+            else:
+                scraper = get_scraper()
+                # The scraper is shared, so report this refresh's share of its stats
+                stats_before = scraper.http.cache.stats()
+                with st.spinner("🌟 Gathering the latest stories..."):
+                    st.session_state.articles = scraper.scrape_news(
+                        total_articles=7)
+                cache_stats = {name: count - stats_before[name]
+                               for name, count in scraper.http.cache.stats().items()}
+            # The old digest's episode is stale once the feed has moved on
+            # (per-story script blocks stay cached for the incremental mode)
+            if previous_articles:
+                for incremental in (False, True):
+                    previous_key = podcast_generator.episode_key(previous_articles, incremental)
+                    if previous_key != podcast_generator.episode_key(
+                            st.session_state.articles, incremental):
+                        podcast_generator.cache.invalidate(previous_key)
+            # Warm the translation cache while the user reads
+            get_pretranslator().submit(st.session_state.articles)
+            if cache_stats is None:
+                st.caption(f"Prefetched feed from "
+                           f"{datetime.fromtimestamp(updated_at).strftime('%H:%M')}")
+            else:
+                st.caption(
+                    f"HTTP cache: {cache_stats['hits']} hits, "
+                    f"{cache_stats['revalidated']} revalidated, "
+                    f"{cache_stats['misses']} misses")
 
         # Language selector logic
         # selected_language = st.selectbox(
@@ -946,6 +676,9 @@ def main():
     # News Feed Tab
     with tabs[0]:
         if st.session_state.articles:
+            translator = get_translator()
+            pretranslator = get_pretranslator()
+            tts = get_tts(openai_api_key)
             for idx, article in enumerate(st.session_state.articles):
                 with st.container():
                     st.markdown(f"""
@@ -953,7 +686,8 @@ def main():
                             {article['source']}
                         </div>
                     """, unsafe_allow_html=True)
-                    display_article(article, idx, translator, tts)
+                    display_article(article, idx, translator, tts,
+                                    pretranslator)
         else:
             st.markdown("""
                 <div class='article-card' style='text-align: center;'>
@@ -976,13 +710,35 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
 
+            # The stream server is only reachable from other machines
+            # through PODCAST_STREAM_BASE_URL; otherwise play the finished file
+            stream_playback = st.checkbox(
+                "Start playing while the episode is generated",
+                value=stream_url_configured())
+            incremental = st.checkbox(
+                "Only rewrite stories that changed since the last episode", value=True)
+            regenerate = st.checkbox("Regenerate instead of using the saved episode")
             if st.button("🎵 Generate Today's Podcast", key="generate_podcast"):
+                podcast_generator = get_podcast_generator(openai_api_key)
                 with st.spinner("Creating your personalized news podcast..."):
-                    podcast_path, script = podcast_generator.create_podcast(
-                        st.session_state.articles)
-                    if podcast_path:
+                    if stream_playback:
+                        podcast_path, script = podcast_generator.stream_podcast(
+                            st.session_state.articles, refresh=regenerate,
+                            incremental=incremental, play_file=st.audio,
+                            play_stream=play_stream)
+                    else:
+                        podcast_path, script = podcast_generator.create_podcast(
+                            st.session_state.articles, refresh=regenerate,
+                            incremental=incremental)
+                    if podcast_path and podcast_generator.has_episode(
+                            st.session_state.articles, incremental):
                         st.success("✨ Your podcast is ready!")
-                        st.audio(podcast_path)
+                    elif podcast_path:
+                        st.warning("Parts of this episode are missing. "
+                                   "Generate it again in a minute to fill the gaps.")
+                    if podcast_path:
+                        if not stream_playback:
+                            st.audio(podcast_path)
                         with st.expander("📝 View Podcast Script"):
                             st.markdown(script)
                     else:
@@ -1021,6 +777,11 @@ def main():
         </div>
     """, unsafe_allow_html=True)
 
+    # Rendered last, so the numbers include this run's work
+    if st.sidebar.checkbox("Show diagnostics"):
+        with st.sidebar:
+            show_diagnostics()
+
 
 if __name__ == "__main__":
     main()
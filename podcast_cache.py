@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import threading
+from fingerprint import content_fingerprint
+
+
+class PodcastCache:
+    """
+    Podcast scripts and finished episodes on disk, one directory per
+    article set. The key covers the ordered article fingerprints and the
+    generation settings (personas, models), so a rerun, a reload or another
+    user asking for the same digest gets the stored episode, while any
+    change to the feed or the hosts produces a new key. Incremental
+    episodes store their per-article script blocks the same way, keyed by
+    a one-article set. Only the `max_entries` most recently used entries
+    are kept.
+    """
+
+    def __init__(self, cache_dir='.cache/podcasts', max_entries=300):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def episode_key(self, articles, settings):
+        fingerprints = [
+            article.get('text_hash') or content_fingerprint(article['title'], article['summary'])
+            for article in articles
+        ]
+        return content_fingerprint(json.dumps(fingerprints),
+                                   json.dumps(settings, sort_keys=True))
+
+    def _path(self, key, name):
+        return os.path.join(self.cache_dir, key, name)
+
+    def _write(self, key, name, write):
+        path = self._path(key, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._prune()
+        return path
+
+    def get_script(self, key):
+        try:
+            with open(self._path(key, 'script.txt'), encoding='utf-8') as f:
+                script = f.read()
+            os.utime(os.path.join(self.cache_dir, key))  # mark as recently used
+            return script
+        except OSError:
+            return None
+
+    def put_script(self, key, script):
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(script)
+        self._write(key, 'script.txt', write)
+
+    def get_episode(self, key):
+        """Return (episode path, script) if both are cached, else None."""
+        path = self._path(key, 'episode.mp3')
+        script = self.get_script(key)
+        if script is None or not os.path.exists(path):
+            return None
+        return path, script
+
+    def put_episode(self, key, source_path):
+        """Copy a finished episode into the cache and return its cached path."""
+        return self._write(key, 'episode.mp3',
+                           lambda path: shutil.copyfile(source_path, path))
+
+    def invalidate(self, key):
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    def _prune(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.stat(path).st_mtime, path))
+                except OSError:
+                    continue
+            for _, path in sorted(entries, reverse=True)[self.max_entries:]:
+                shutil.rmtree(path, ignore_errors=True)
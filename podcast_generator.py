@@ -0,0 +1,493 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from audio_cache import AudioCache
+from api_retry import call_with_retry, rate_limit_gate
+from script_parser import ScriptSegmentParser
+from podcast_stream import ProgressiveEpisode, stream_server
+from podcast_cache import PodcastCache
+from mp3_assembly import Mp3Assembler
+from metrics import metrics, span, timed, count
+
+
+class NullProgress:
+    """Progress bar stand-in for runs without a UI."""
+
+    def progress(self, value, text=None):
+        pass
+
+    def empty(self):
+        pass
+
+
+class PodcastGenerator:
+    """
+    Turns a feed into a two-host podcast episode: GPT writes the script,
+    each speaker turn is synthesized and the segments are spliced into one
+    MP3. Scripts, segment audio and episodes are cached.
+
+    Front-end hooks: `on_error(message)` and `on_status(message)` report
+    to the user, `new_progress()` returns a progress bar (an object with
+    progress(value, text=...) and empty()) and `thread_initializer()`
+    builds the worker pool initializer, as in NewsContentScraper.
+    """
+
+    def __init__(self, openai_client, max_workers=4, max_retries=4,
+                 cache=None, audio_cache=None, on_error=print, on_status=print,
+                 new_progress=None, thread_initializer=None):
+        self.client = openai_client
+        self.on_error = on_error
+        self.on_status = on_status
+        self.new_progress = new_progress or NullProgress
+        self.thread_initializer = thread_initializer
+        # Segments are synthesized in parallel, bounded to stay near the TTS rate limit
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.script_model = "gpt-4-turbo-preview"
+        self.tts_model = "tts-1"
+        # Scripts and episodes per article set; segment audio per text and voice
+        self.cache = cache if cache is not None else PodcastCache()
+        self.audio_cache = audio_cache if audio_cache is not None else AudioCache()
+        self.host_personas = {
+            "Sarah": {
+                "personality": "warm and engaging lead host, asks insightful questions",
+                "voice": "nova",
+                "pause_after": 0.5  # seconds
+            },
+            "Mike": {
+                "personality": "enthusiastic co-host with a bit of humor, provides context and analysis",
+                "voice": "onyx",
+                "pause_after": 0.5  # seconds
+            }
+        }
+
+    def worker_pool(self):
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=self.thread_initializer() if self.thread_initializer else None)
+
+    def script_settings(self):
+        return {
+            'personas': self.host_personas,
+            'script_model': self.script_model,
+            'tts_model': self.tts_model
+        }
+
+    def episode_key(self, articles, incremental=False):
+        settings = self.script_settings()
+        if incremental:
+            # The intro is dated, so an incremental episode is only good for the day
+            settings.update(incremental=True, date=datetime.now().strftime('%Y-%m-%d'))
+        return self.cache.episode_key(articles, settings)
+
+    def has_episode(self, articles, incremental=False):
+        """True if a complete episode for `articles` is cached; gapped ones never are."""
+        return self.cache.get_episode(self.episode_key(articles, incremental)) is not None
+
+    def report_missing(self, audio_paths):
+        missing = sum(1 for path in audio_paths if not path)
+        if missing:
+            count('episodes_incomplete')
+            self.on_error(f"{missing} of {len(audio_paths)} podcast segments could not be "
+                          f"generated, so the episode has gaps and wasn't saved")
+
+    def build_script_messages(self, articles):
+        # Prepare the news content for the prompt
+        news_content = "\n\n".join([
+            f"Article from {article['source']}:\nTitle: {article['title']}\nSummary: {article['summary']}"
+            for article in articles
+        ])
+
+        # Create the prompt for the conversation
+        prompt = f"""Create a natural, engaging podcast conversation between two hosts discussing today's Minnesota news. 
+        
+        Host Personas:
+        - Sarah: {self.host_personas['Sarah']['personality']}
+        - Mike: {self.host_personas['Mike']['personality']}
+
+        Format the conversation using [Sarah] and [Mike] tags. Include reactions, questions, and natural transitions.
+        Keep each speaking segment under 30 seconds for better audio flow.
+
+        Start with a welcome and end with a sign-off.
+        Make the discussion feel natural and conversational, not just reading headlines.
+        
+        Today's News Content:
+        {news_content}"""
+
+        return [{
+            "role": "system",
+            "content": "You are a podcast script writer creating engaging conversations about news."
+        },
+            {
+            "role": "user",
+            "content": prompt
+        }]
+
+    def build_part_messages(self, part, article=None):
+        """Prompt for one independently cached piece of an incremental script."""
+        if part == 'intro':
+            task = f"""Write the opening of today's episode ({datetime.now().strftime('%A, %B %d')}): a short,
+        warm welcome to the Minnesota news podcast. Don't discuss any stories yet."""
+        elif part == 'outro':
+            task = """Write a short sign-off for the end of the episode. Don't recap specific stories."""
+        else:
+            task = f"""Write the hosts' discussion of one story from today's Minnesota news. Open with a
+        brief transition into the story; don't welcome listeners or sign off, other stories
+        come before and after it.
+
+        Article from {article['source']}:
+        Title: {article['title']}
+        Summary: {article['summary']}"""
+
+        prompt = f"""{task}
+
+        Host Personas:
+        - Sarah: {self.host_personas['Sarah']['personality']}
+        - Mike: {self.host_personas['Mike']['personality']}
+
+        Format the conversation using [Sarah] and [Mike] tags. Include reactions and questions.
+        Keep each speaking segment under 30 seconds for better audio flow."""
+
+        return [{
+            "role": "system",
+            "content": "You are a podcast script writer creating engaging conversations about news."
+        },
+            {
+            "role": "user",
+            "content": prompt
+        }]
+
+    def generate_incremental_script(self, articles, refresh=False):
+        """
+        Assemble the script from an intro, one block per article and an
+        outro, each cached on its own. Only blocks for new or changed
+        articles are written, and their unchanged turns keep hitting the
+        audio cache, so an hourly refresh with one new story costs one GPT
+        call and a handful of TTS calls.
+
+        Returns (script, complete); `complete` is False when a block
+        couldn't be written and the script leaves it out. Blocks that were
+        written stay cached either way.
+        """
+        settings = self.script_settings()
+        today = datetime.now().strftime('%Y-%m-%d')
+        parts = [(self.cache.episode_key([], dict(settings, part='intro', date=today)),
+                  self.build_part_messages('intro'))]
+        parts += [(self.cache.episode_key([article], dict(settings, part='story')),
+                   self.build_part_messages('story', article))
+                  for article in articles]
+        parts.append((self.cache.episode_key([], dict(settings, part='outro')),
+                      self.build_part_messages('outro')))
+
+        blocks = [None if refresh else self.cache.get_script(key) for key, _ in parts]
+        missing = [i for i, block in enumerate(blocks) if not block]
+
+        def write_block(index):
+            key, messages = parts[index]
+            try:
+                count('api_calls', service='chat', model=self.script_model)
+                with span('script', mode='block'):
+                    response = call_with_retry(
+                        lambda: self.client.chat.completions.create(
+                            model=self.script_model,
+                            messages=messages,
+                            temperature=0.7
+                        ),
+                        max_retries=self.max_retries,
+                        gate=rate_limit_gate(self.client, 'chat')
+                    )
+                block = response.choices[0].message.content
+                if block:
+                    self.cache.put_script(key, block)
+                return block
+            except Exception as e:
+                self.on_error(f"Error generating podcast script: {str(e)}")
+                return None
+
+        count('script_blocks', len(parts) - len(missing), result='reused')
+        count('script_blocks', len(missing), result='written')
+        if missing:
+            with self.worker_pool() as pool:
+                for index, block in zip(missing, pool.map(write_block, missing)):
+                    blocks[index] = block
+        self.on_status(f"Reused {len(parts) - len(missing)} of {len(parts)} script blocks")
+
+        if not any(blocks[1:-1]):
+            return None, False
+        failed = sum(1 for block in blocks if not block)
+        if failed:
+            count('episodes_incomplete')
+            self.on_error(f"{failed} of {len(parts)} script blocks could not be written, "
+                          f"so the episode leaves them out and wasn't saved")
+        return "\n\n".join(block for block in blocks if block), not failed
+
+    def generate_podcast_script(self, articles):
+        try:
+            count('api_calls', service='chat', model=self.script_model)
+            with span('script', mode='full'):
+                response = self.client.chat.completions.create(
+                    model=self.script_model,
+                    messages=self.build_script_messages(articles),
+                    temperature=0.7
+                )
+            return response.choices[0].message.content
+        except Exception as e:
+            self.on_error(f"Error generating podcast script: {str(e)}")
+            return None
+
+    def stream_script_segments(self, articles, transcript):
+        """
+        Request the script in streaming mode and yield each speaker turn as
+        soon as the model closes it. The raw text accumulates in `transcript`,
+        which is cleared if the stream fails so a partial script isn't kept.
+        """
+        parser = ScriptSegmentParser(self.host_personas)
+        start = time.perf_counter()
+        try:
+            count('api_calls', service='chat', model=self.script_model)
+            stream = self.client.chat.completions.create(
+                model=self.script_model,
+                messages=self.build_script_messages(articles),
+                temperature=0.7,
+                stream=True
+            )
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not transcript:
+                        metrics.observe('script_first_token', time.perf_counter() - start)
+                    transcript.append(delta)
+                    yield from parser.feed(delta)
+            # Includes the time TTS spent on turns between chunks
+            metrics.observe('script', time.perf_counter() - start, mode='stream')
+        except Exception as e:
+            count('errors', stage='script', mode='stream')
+            self.on_error(f"Error generating podcast script: {str(e)}")
+            transcript.clear()
+        yield from parser.close()
+
+    def split_script_into_segments(self, script):
+        parser = ScriptSegmentParser(self.host_personas)
+        return parser.feed(script) + parser.close()
+
+    def generate_audio_segment(self, text, speaker):
+        """Return the path of the segment's audio, synthesizing only on a cache miss."""
+        try:
+            voice = self.host_personas[speaker]['voice']
+
+            def synthesize(output_path):
+                count('api_calls', service='tts', model=self.tts_model)
+                with span('tts', caller='podcast'):
+                    # Parallel segments can trip the rate limit; back off and retry
+                    response = call_with_retry(
+                        lambda: self.client.audio.speech.create(
+                            model=self.tts_model,
+                            voice=voice,
+                            input=text,
+                            response_format="mp3"
+                        ),
+                        max_retries=self.max_retries,
+                        gate=rate_limit_gate(self.client, 'tts')
+                    )
+                    response.stream_to_file(output_path)
+
+            return self.audio_cache.get_or_create(text, voice, self.tts_model, synthesize)
+        except Exception as e:
+            self.on_error(f"Error generating audio segment: {str(e)}")
+            return None
+
+    def synthesize_segments(self, segments, on_segment=None):
+        """
+        Synthesize segments concurrently, returning paths in script order.
+
+        `segments` may be a list or an iterator that is still producing
+        turns (see stream_script_segments); each turn is submitted as soon
+        as it arrives. `on_segment(index, segment, path)` is called in
+        script order as soon as every earlier segment is done, so playback
+        can start before the last one is synthesized.
+        """
+        ready = {}
+        next_index = 0
+        dispatch_lock = threading.Lock()
+
+        def synthesize(index, segment):
+            nonlocal next_index
+            audio_path = self.generate_audio_segment(segment['text'], segment['speaker'])
+            if on_segment:
+                with dispatch_lock:
+                    ready[index] = (segment, audio_path)
+                    while next_index in ready:
+                        on_segment(next_index, *ready.pop(next_index))
+                        next_index += 1
+            return audio_path
+
+        audio_paths = []
+        progress = self.new_progress()
+        with self.worker_pool() as pool:
+            futures = {}
+            for i, segment in enumerate(segments):
+                futures[pool.submit(synthesize, i, segment)] = i
+                audio_paths.append(None)
+                progress.progress(0.0, text=f"Scripted {len(futures)} segments...")
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                audio_paths[futures[future]] = future.result()
+                progress.progress(done / len(futures),
+                                  text=f"Generated {done}/{len(futures)} audio segments")
+        progress.empty()
+        return audio_paths
+
+    @timed('create_podcast')
+    def create_podcast(self, articles, refresh=False, incremental=False):
+        """
+        Build the episode for `articles`, or return the cached one. With
+        `refresh` the cached script and episode are discarded first;
+        `incremental` builds the script from per-article cached blocks.
+        """
+        key = self.episode_key(articles, incremental)
+        if refresh:
+            self.cache.invalidate(key)
+        cached = self.cache.get_episode(key)
+        if cached:
+            return cached
+
+        # Generate the script, unless an earlier run already has
+        script = self.cache.get_script(key)
+        complete = True
+        if not script:
+            if incremental:
+                script, complete = self.generate_incremental_script(articles, refresh)
+            else:
+                script = self.generate_podcast_script(articles)
+            if not script:
+                return None, None
+            # A script missing story blocks must not be served for this episode
+            if complete:
+                self.cache.put_script(key, script)
+
+        # Split into segments
+        segments = self.split_script_into_segments(script)
+
+        # Generate audio for all segments in parallel, kept in script order
+        audio_paths = self.synthesize_segments(segments)
+        self.report_missing(audio_paths)
+        audio_files = [
+            {
+                'path': audio_path,
+                'pause_after': self.host_personas[segment['speaker']]['pause_after']
+            }
+            for segment, audio_path in zip(segments, audio_paths)
+            if audio_path
+        ]
+        if not audio_files:
+            return None, script
+
+        # Combine all audio segments frame by frame, without re-encoding
+        output_dir = tempfile.mkdtemp(prefix="podcast_")
+        output_path = os.path.join(output_dir, "episode.mp3")
+        try:
+            try:
+                self.assemble_frames(audio_files, output_path)
+            except ValueError:
+                # Segments in different formats can't be spliced; re-encode instead
+                self.assemble_with_pydub(audio_files, output_path)
+            if len(audio_files) < len(segments) or not complete:
+                # Don't cache an episode with missing segments or stories
+                fd, final_path = tempfile.mkstemp(prefix="podcast_", suffix=".mp3")
+                os.close(fd)
+                shutil.copyfile(output_path, final_path)
+                return final_path, script
+            return self.cache.put_episode(key, output_path), script
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    @timed('assembly', method='frames')
+    def assemble_frames(self, audio_files, output_path):
+        with Mp3Assembler(output_path) as assembler:
+            for audio_file in audio_files:
+                assembler.add_file(audio_file['path'])
+                # Add pause between segments
+                assembler.add_silence(audio_file['pause_after'])
+
+    @timed('assembly', method='pydub')
+    def assemble_with_pydub(self, audio_files, output_path):
+        from pydub import AudioSegment
+
+        final_audio = AudioSegment.empty()
+        for audio_file in audio_files:
+            final_audio += AudioSegment.from_mp3(audio_file['path'])
+            final_audio += AudioSegment.silent(
+                duration=int(audio_file['pause_after'] * 1000))
+        final_audio.export(output_path, format="mp3")
+
+    @timed('stream_podcast')
+    def stream_podcast(self, articles, refresh=False, incremental=False,
+                       play_file=None, play_stream=None):
+        """
+        Like create_podcast, but overlaps every stage: the script is
+        streamed and each finished turn goes straight to TTS, and a
+        progressive episode is published right away so playback starts
+        after the first segment. Segments are concatenated as MP3 frames,
+        no re-encode. A cached episode is handed to `play_file(path)`, a
+        new one to `play_stream(url)` as soon as it is published.
+        """
+        key = self.episode_key(articles, incremental)
+        if refresh:
+            self.cache.invalidate(key)
+        cached = self.cache.get_episode(key)
+        if cached:
+            if play_file:
+                play_file(cached[0])
+            return cached
+
+        # Unique per run: sessions share the generator and may stream at once
+        output_dir = tempfile.mkdtemp(prefix="podcast_")
+        output_path = os.path.join(output_dir, "episode.mp3")
+        episode = ProgressiveEpisode(output_path)
+        stream_url = stream_server().publish(episode)
+        if play_stream:
+            play_stream(stream_url)
+
+        def append_segment(index, segment, audio_path):
+            if not audio_path:
+                return
+            with open(audio_path, 'rb') as f:
+                episode.append(f.read())
+            episode.append_silence(self.host_personas[segment['speaker']]['pause_after'])
+
+        script = self.cache.get_script(key)
+        complete = True
+        if not script and incremental:
+            script, complete = self.generate_incremental_script(articles, refresh)
+        if script:
+            transcript = [script]
+            segments = self.split_script_into_segments(script)
+        else:
+            transcript = []
+            segments = self.stream_script_segments(articles, transcript)
+        try:
+            audio_paths = self.synthesize_segments(segments, on_segment=append_segment)
+        finally:
+            episode.finish()
+        self.report_missing(audio_paths)
+
+        script = ''.join(transcript)
+        if script and complete:
+            self.cache.put_script(key, script)
+        if not script or not any(audio_paths):
+            shutil.rmtree(output_dir, ignore_errors=True)
+            return None, script or None
+        if complete and all(audio_paths):
+            cached_path = self.cache.put_episode(key, output_path)
+            # Listeners that connect later read the cached copy
+            episode.relocate(cached_path)
+            shutil.rmtree(output_dir, ignore_errors=True)
+            return cached_path, script
+        # A gapped episode isn't cached; its unique temp file is the only copy
+        return output_path, script
@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from mp3_assembly import mp3_frames, silence_frames
+
+
+class ProgressiveEpisode:
+    """An MP3 file that grows segment by segment while listeners read it."""
+
+    def __init__(self, path):
+        self.path = path
+        self.size = 0
+        self.format = None
+        self.done = False
+        self.finished_at = None
+        self._cond = threading.Condition()
+        open(path, 'wb').close()
+
+    def _write(self, data):
+        with open(self.path, 'ab') as f:
+            f.write(data)
+        with self._cond:
+            self.size += len(data)
+            self._cond.notify_all()
+
+    def append(self, mp3_bytes):
+        """Append a segment's bare audio frames (tags and Xing header dropped)."""
+        frames, fmt = mp3_frames(mp3_bytes)
+        if fmt is None:
+            return
+        self.format = self.format or fmt
+        self._write(frames)
+
+    def append_silence(self, seconds):
+        if self.format is not None and seconds > 0:
+            self._write(silence_frames(self.format, seconds))
+
+    def finish(self):
+        with self._cond:
+            self.done = True
+            self.finished_at = time.time()
+            self._cond.notify_all()
+
+    def open(self):
+        """Open the episode for reading, never mid-relocate()."""
+        with self._cond:
+            return open(self.path, 'rb')
+
+    def relocate(self, path):
+        """
+        Point new listeners at a copy of the finished file (e.g. in the
+        cache), so the original can be deleted; open readers keep theirs.
+        """
+        with self._cond:
+            self.path = path
+
+    def wait_for_data(self, offset, timeout=30):
+        """Block until bytes past `offset` exist or the episode is finished."""
+        with self._cond:
+            while self.size <= offset and not self.done:
+                if not self._cond.wait(timeout=timeout):
+                    break
+            return self.size, self.done
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    # Chunked transfer encoding only exists in HTTP/1.1; on a 1.0 response
+    # clients would play the chunk-size lines as audio
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        episode_id = os.path.splitext(os.path.basename(self.path))[0]
+        episode = self.server.stream.get(episode_id)
+        try:
+            f = episode.open() if episode is not None else None
+        except OSError:
+            f = None
+        if f is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/mpeg')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        offset = 0
+        try:
+            with f:
+                while True:
+                    size, done = episode.wait_for_data(offset)
+                    if size > offset:
+                        f.seek(offset)
+                        data = f.read(size - offset)
+                        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                        self.wfile.flush()
+                        offset += len(data)
+                    elif done:
+                        break
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # listener closed the player
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StreamServer:
+    """
+    Local HTTP endpoint that serves progressive episodes with chunked
+    transfer encoding, so a browser <audio> element starts playing the
+    first segments while later ones are still being synthesized.
+
+    The player URL uses PODCAST_STREAM_BASE_URL when set (e.g. behind a
+    reverse proxy forwarding to PODCAST_STREAM_PORT), otherwise
+    http://<host>:<port>, which only works for a browser on the same machine.
+
+    Finished episodes stay available for `ttl` seconds (for replays), and
+    at most `max_episodes` are kept.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, max_episodes=20, ttl=30 * 60):
+        self.max_episodes = max_episodes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.episodes = OrderedDict()
+        self.httpd = ThreadingHTTPServer((host, port), _StreamHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stream = self
+        self.base_url = os.environ.get(
+            'PODCAST_STREAM_BASE_URL',
+            f"http://{host}:{self.httpd.server_address[1]}").rstrip('/')
+        threading.Thread(target=self.httpd.serve_forever, daemon=True,
+                         name='podcast-stream').start()
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        expired = [episode_id for episode_id, episode in self.episodes.items()
+                   if episode.finished_at is not None and episode.finished_at < cutoff]
+        for episode_id in expired:
+            del self.episodes[episode_id]
+        while len(self.episodes) > self.max_episodes:
+            self.episodes.popitem(last=False)
+
+    def get(self, episode_id):
+        with self._lock:
+            self._expire()
+            return self.episodes.get(episode_id)
+
+    def publish(self, episode):
+        episode_id = uuid.uuid4().hex
+        with self._lock:
+            self.episodes[episode_id] = episode
+            self._expire()
+        return f"{self.base_url}/episodes/{episode_id}.mp3"
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def stream_server():
+    """
+    Process-wide stream server, started on first use. It listens on
+    PODCAST_STREAM_HOST:PODCAST_STREAM_PORT (default: a free local port).
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = StreamServer(host=os.environ.get('PODCAST_STREAM_HOST', '127.0.0.1'),
+                                   port=int(os.environ.get('PODCAST_STREAM_PORT', 0)))
+        return _server
+
+
+def stream_url_configured():
+    """True when PODCAST_STREAM_BASE_URL says how browsers reach the stream server."""
+    return bool(os.environ.get('PODCAST_STREAM_BASE_URL'))
@@ -0,0 +1,188 @@
+"""
+Headless prefetch worker that keeps the podcast app's feed warm.
+
+    python prefetch.py            # run on a schedule until stopped
+    python prefetch.py --once     # one full pass, e.g. from cron
+
+The app's "Refresh News Feed" then reads the prefetched feed from the
+FeedStore instead of scraping while the user waits.
+"""
+import argparse
+import os
+import random
+import signal
+import threading
+import time
+from datetime import datetime
+from feed_store import FeedStore
+from news_scraper import NewsContentScraper, PODCAST_PROFILE, PODCAST_FEED
+from translation import LanguageConfig, ArticleTranslator
+from speech import TextToSpeech
+from services import use_fake_services
+from metrics import metrics_server
+from extraction_pool import extraction_pool
+
+
+def log(message):
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+
+class PrefetchDaemon:
+    """
+    Runs the scrape pipeline ahead of the users: scrape the sources that are
+    due, compose the feed into the FeedStore, then translate it into the hot
+    languages and synthesize the summaries' audio, so the app's caches are
+    already filled when someone reads or listens.
+
+    Each source is rescraped every `base_interval * priority` seconds, so a
+    priority 2 source runs half as often as a priority 1 source. Every wait
+    is jittered by +/- `jitter` so sources (and several workers) drift apart
+    instead of hitting the sites in lockstep.
+    """
+
+    def __init__(self, scraper, store, translator=None, tts=None, language_codes=(),
+                 audio_languages=('english',), feed_name=PODCAST_FEED, total_articles=7,
+                 articles_per_source=10, base_interval=900, jitter=0.2):
+        self.scraper = scraper
+        self.store = store
+        self.translator = translator
+        self.tts = tts
+        self.language_codes = [code for code in language_codes if code != 'en']
+        self.audio_languages = audio_languages
+        self.feed_name = feed_name
+        self.total_articles = total_articles
+        self.articles_per_source = articles_per_source
+        self.base_interval = base_interval
+        self.jitter = jitter
+        self.next_due = {source_name: 0 for source_name in scraper.sources}
+        self._stop = threading.Event()
+
+    def interval_for(self, source_name):
+        return self.base_interval * self.scraper.sources[source_name].get('priority', 1)
+
+    def schedule(self, source_name, now):
+        interval = self.interval_for(source_name)
+        self.next_due[source_name] = now + interval * random.uniform(
+            1 - self.jitter, 1 + self.jitter)
+
+    def due_sources(self, now):
+        return [source_name for source_name, due in self.next_due.items() if due <= now]
+
+    def run_once(self, source_names=None):
+        """Rescrape `source_names` (default: all), then rebuild and warm the feed."""
+        source_names = list(source_names or self.scraper.sources)
+        started = time.perf_counter()
+        articles = self.scraper.scrape_news(
+            total_articles=self.articles_per_source * len(source_names),
+            source_names=source_names)
+
+        by_source = {source_name: [] for source_name in source_names}
+        for article in articles:
+            by_source[article['source']].append(article)
+        for source_name, source_articles in by_source.items():
+            # A failed scrape keeps serving the source's previous articles
+            if source_articles:
+                self.store.put_source(source_name, source_articles)
+
+        feed = self.scraper.compose_feed(self.store.source_articles(), self.total_articles)
+        self.store.put_feed(self.feed_name, feed)
+        log(f"Scraped {', '.join(source_names)}: {len(articles)} articles, "
+            f"feed of {len(feed)} in {time.perf_counter() - started:.1f}s")
+
+        self.warm(feed)
+        return feed
+
+    def warm(self, feed):
+        """Fill the translation and audio caches the app will read for `feed`."""
+        started = time.perf_counter()
+        if self.translator:
+            texts = [text for article in feed for text in (article['title'], article['summary'])]
+            for code in self.language_codes:
+                self.translator.translate_batch(texts, code)
+
+        if self.tts:
+            for language in self.audio_languages:
+                summaries = [article['summary'] for article in feed]
+                code = LanguageConfig.SUPPORTED_LANGUAGES[language]['code']
+                if self.translator and code != 'en':
+                    summaries = self.translator.translate_batch(summaries, code)
+                # Same text, language and seed as display_article, so the same cache entry
+                for article, summary in zip(feed, summaries):
+                    self.tts.generate_audio(summary, language, voice_seed=article['text_hash'])
+        log(f"Warmed translations and audio in {time.perf_counter() - started:.1f}s")
+
+    def run(self):
+        intervals = ', '.join(f"{source_name} every {self.interval_for(source_name) / 60:g} min"
+                              for source_name in self.scraper.sources)
+        log(f"Prefetching {intervals}")
+        while not self._stop.is_set():
+            due = self.due_sources(time.time())
+            if due:
+                try:
+                    self.run_once(due)
+                except Exception as e:
+                    log(f"Prefetch failed: {str(e)}")
+                now = time.time()
+                for source_name in due:
+                    self.schedule(source_name, now)
+            self._stop.wait(max(1, min(self.next_due.values()) - time.time()))
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--once', action='store_true', help='run one pass and exit')
+    parser.add_argument('--interval', type=float, default=900,
+                        help='seconds between scrapes of a priority 1 source')
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--articles', type=int, default=7, help='articles in the feed')
+    parser.add_argument('--languages', nargs='*', default=LanguageConfig.PRETRANSLATE_LANGUAGES,
+                        help='languages to translate the feed into')
+    parser.add_argument('--audio-languages', nargs='*', default=['english'],
+                        help='languages to pre-synthesize summary audio in')
+    parser.add_argument('--extract-workers', type=int,
+                        help='parse articles in this many worker processes')
+    parser.add_argument('--metrics-port', type=int,
+                        help='serve Prometheus metrics on this port')
+    args = parser.parse_args()
+
+    server = metrics_server(args.metrics_port)
+    if server:
+        log(f"Metrics at {server.url}")
+
+    translator = ArticleTranslator(on_error=log)
+    tts = None
+    openai_api_key = os.environ.get("OPENAI_API_KEY")
+    if (openai_api_key or use_fake_services()) and args.audio_languages:
+        tts = TextToSpeech(openai_api_key, on_error=log)
+    elif args.audio_languages:
+        log("OPENAI_API_KEY is not set; skipping audio")
+
+    daemon = PrefetchDaemon(
+        NewsContentScraper(**PODCAST_PROFILE, on_error=log,
+                           extraction_pool=extraction_pool(args.extract_workers)),
+        FeedStore(),
+        translator=translator,
+        tts=tts,
+        language_codes=[LanguageConfig.SUPPORTED_LANGUAGES[language]['code']
+                        for language in args.languages],
+        audio_languages=args.audio_languages,
+        total_articles=args.articles,
+        base_interval=args.interval,
+        jitter=args.jitter
+    )
+    if args.once:
+        daemon.run_once()
+        return
+
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        daemon.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class FeedPreTranslator:
+    """
+    Translate a freshly scraped feed into the likely languages in the
+    background, so the translation cache is already warm when a reader
+    switches an article's language.
+
+    Background failures go to `on_error` (logging by default): the pool
+    threads have no Streamlit context, so st.error calls would be dropped.
+
+    Use one per feed reader (e.g. per Streamlit session): a new feed
+    cancels the reader's own queued batches. Readers can share a `pool`.
+    """
+
+    def __init__(self, translator, language_codes, max_workers=2,
+                 on_error=logger.warning, pool=None):
+        self.translator = translator
+        self.language_codes = [code for code in language_codes if code != 'en']
+        self.on_error = on_error
+        self.owns_pool = pool is None
+        self.pool = pool if pool is not None else ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='pretranslate')
+        self._lock = threading.Lock()
+        self.pending = {}  # language code -> (future, texts in the batch)
+
+    def submit(self, articles):
+        """Queue one batched translation of all titles and summaries per language."""
+        texts = []
+        for article in articles:
+            texts.extend([article['title'], article['summary']])
+        if not texts:
+            return {}
+
+        with self._lock:
+            for code in self.language_codes:
+                previous = self.pending.get(code)
+                if previous is not None:
+                    previous[0].cancel()  # a newer feed supersedes a queued one
+                future = self.pool.submit(
+                    self.translator.translate_batch, texts, code, on_error=self.on_error)
+                self.pending[code] = (future, frozenset(texts))
+            return {code: future for code, (future, _) in self.pending.items()}
+
+    def wait(self, language_code, texts, timeout=1.5):
+        """
+        Give the background batch for `language_code` up to `timeout`
+        seconds if it covers any of `texts` and is still running. Whatever
+        isn't done by then is translated in the foreground by the caller.
+        """
+        with self._lock:
+            entry = self.pending.get(language_code)
+        if entry is None:
+            return
+        future, batch_texts = entry
+        if future.done() or future.cancelled() or batch_texts.isdisjoint(texts):
+            return
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            pass  # timed out or failed: the foreground translation takes over
+
+    def shutdown(self):
+        with self._lock:
+            for future, _ in self.pending.values():
+                future.cancel()
+        if self.owns_pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
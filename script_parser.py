@@ -0,0 +1,53 @@
+class ScriptSegmentParser:
+    """
+    Incremental parser for [Speaker]-tagged podcast scripts.
+
+    Text can be fed in arbitrary pieces (e.g. streamed completion deltas).
+    A speaker's turn is emitted as soon as the next speaker tag shows up,
+    and close() flushes the final turn. Feeding a whole script at once
+    gives the same segments as parsing it line by line.
+    """
+
+    def __init__(self, speakers):
+        self.tags = {f"[{speaker}]": speaker for speaker in speakers}
+        self._partial_line = ''
+        self._speaker = None
+        self._text = []
+
+    def _finish_segment(self):
+        if self._speaker:
+            return [{'speaker': self._speaker, 'text': ' '.join(self._text)}]
+        return []
+
+    def _parse_line(self, line):
+        line = line.strip()
+        if not line:
+            return []
+
+        for tag, speaker in self.tags.items():
+            if tag in line:
+                segments = self._finish_segment()
+                self._speaker = speaker
+                self._text = [line.replace(tag, '').strip()]
+                return segments
+
+        self._text.append(line)
+        return []
+
+    def feed(self, text):
+        """Add streamed text; returns the segments completed by it."""
+        lines = (self._partial_line + text).split('\n')
+        self._partial_line = lines.pop()
+        segments = []
+        for line in lines:
+            segments.extend(self._parse_line(line))
+        return segments
+
+    def close(self):
+        """Flush the trailing line and the last open segment."""
+        segments = self._parse_line(self._partial_line)
+        self._partial_line = ''
+        if self._speaker and self._text:
+            segments.extend(self._finish_segment())
+        self._speaker, self._text = None, []
+        return segments
@@ -0,0 +1,32 @@
+"""
+Clients for the external AI services. Setting MINNEDIGEST_SERVICES=fake
+swaps OpenAI and Google Translate for the local stand-ins in
+fake_services.py, so the apps and the prefetch daemon can be load tested
+or demoed without API keys.
+"""
+import os
+
+
+def use_fake_services():
+    return os.environ.get('MINNEDIGEST_SERVICES', '').lower() == 'fake'
+
+
+def openai_client(api_key=None):
+    if use_fake_services():
+        from fake_services import FakeOpenAI
+
+        return FakeOpenAI.from_env()
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+def translator_factory():
+    """Return make_translator(target_lang) for BatchTranslator."""
+    if use_fake_services():
+        from fake_services import FakeTranslationService
+
+        return FakeTranslationService.from_env()
+    from deep_translator import GoogleTranslator
+
+    return lambda target_lang: GoogleTranslator(source='en', target=target_lang)
@@ -0,0 +1,54 @@
+from audio_cache import AudioCache, pick_voice
+from api_retry import call_with_retry, rate_limit_gate
+from services import openai_client
+from translation import LanguageConfig
+from metrics import span, count
+
+
+class TextToSpeech:
+    def __init__(self, api_key, cache=None, model="tts-1", client=None, on_error=print,
+                 max_retries=4):
+        self.api_key = api_key
+        self._client = client
+        self.on_error = on_error
+        self.max_retries = max_retries
+        self.language_config = LanguageConfig
+        self.model = model
+        # Re-listening or re-rendering never re-synthesizes the same audio
+        self.cache = cache if cache is not None else AudioCache()
+
+    @property
+    def client(self):
+        # Built on first synthesis, so rendering the page never imports openai
+        if self._client is None:
+            self._client = openai_client(self.api_key)
+        return self._client
+
+    def generate_audio(self, text, language, voice_seed=None):
+        """Return the path of an MP3 of `text`, synthesizing only on a cache miss."""
+        try:
+            voice_options = self.language_config.SUPPORTED_LANGUAGES[language]['voice_options']
+            # Deterministic per article, so the cache key is stable
+            chosen_voice = pick_voice(voice_options, voice_seed or text)
+
+            def synthesize(output_path):
+                count('api_calls', service='tts', model=self.model)
+                with span('tts', caller='article', language=language):
+                    # Prefetch and the podcast share the TTS rate limit; back off and retry
+                    response = call_with_retry(
+                        lambda: self.client.audio.speech.create(
+                            model=self.model,
+                            voice=chosen_voice,
+                            input=text,
+                            response_format="mp3"
+                        ),
+                        max_retries=self.max_retries,
+                        gate=rate_limit_gate(self.client, 'tts')
+                    )
+                    response.stream_to_file(output_path)
+
+            return self.cache.get_or_create(
+                text, chosen_voice, self.model, synthesize)
+        except Exception as e:
+            self.on_error(f"Error generating audio: {str(e)}")
+            return None
@@ -0,0 +1,70 @@
+from translation_cache import TranslationCache
+from batch_translation import BatchTranslator
+from services import translator_factory
+from metrics import span, count
+
+
+class LanguageConfig:
+    SUPPORTED_LANGUAGES = {
+        'english': {'code': 'en', 'voice_options': ['coral', 'onyx', 'nova', 'sage']},
+        'spanish': {'code': 'es', 'voice_options': ['alloy', 'echo', 'fable', 'onyx']},
+        'french': {'code': 'fr', 'voice_options': ['alloy', 'echo', 'nova', 'shimmer']},
+        'german': {'code': 'de', 'voice_options': ['onyx', 'nova', 'fable', 'echo']},
+        'hindi': {'code': 'hi', 'voice_options': ['alloy', 'echo', 'nova']},
+        'tamil': {'code': 'ta', 'voice_options': ['alloy', 'echo', 'nova']},
+        'russian': {'code': 'ru', 'voice_options': ['alloy', 'echo', 'fable', 'nova']},
+        'italian': {'code': 'it', 'voice_options': ['alloy', 'echo', 'shimmer', 'nova']},
+        'japanese': {'code': 'ja', 'voice_options': ['alloy', 'echo', 'nova']},
+        'chinese-simplified': {'code': 'ny', 'voice_options': ['alloy', 'echo', 'fable']},
+        'chinese': {'code': 'zh-CN', 'voice_options': ['alloy', 'echo', 'fable']}
+
+    }
+
+    # Languages the feed is translated into in the background after a refresh
+    PRETRANSLATE_LANGUAGES = ['spanish', 'hindi', 'chinese']
+
+    @classmethod
+    def pretranslate_codes(cls):
+        return [cls.SUPPORTED_LANGUAGES[language]['code']
+                for language in cls.PRETRANSLATE_LANGUAGES]
+
+
+class ArticleTranslator:
+    def __init__(self, cache=None, on_error=print, make_translator=None):
+        # Streamlit reruns re-translate the same text constantly; cache it
+        self.cache = cache if cache is not None else TranslationCache()
+        self.on_error = on_error
+        # Packs whole sentences from many texts into few concurrent requests
+        # (Google Translate unless services.py selects the local stand-in)
+        self.batcher = BatchTranslator(make_translator or translator_factory())
+
+    def translate_batch(self, texts, target_lang, on_error=None):
+        """
+        Translate several texts at once; cached texts cost no request.
+        Failures go to `on_error` if given, else to the translator's own.
+        """
+        try:
+            if target_lang == 'en':  # Skip translation for English
+                return list(texts)
+
+            translations = [self.cache.get(text, target_lang) for text in texts]
+            missing = list(dict.fromkeys(
+                text for text, translated in zip(texts, translations) if translated is None))
+            count('translation_texts', sum(translated is not None for translated in translations),
+                  lang=target_lang, result='hit')
+            if missing:
+                count('translation_texts', len(missing), lang=target_lang, result='miss')
+                with span('translate', lang=target_lang):
+                    fresh = dict(zip(missing, self.batcher.translate(missing, target_lang)))
+                for text, translated in fresh.items():
+                    if translated:
+                        self.cache.put(text, target_lang, translated)
+                translations = [fresh[text] if translated is None else translated
+                                for text, translated in zip(texts, translations)]
+            return translations
+        except Exception as e:
+            (on_error or self.on_error)(f"Translation error: {str(e)}")
+            return list(texts)
+
+    def translate_text(self, text, target_lang):
+        return self.translate_batch([text], target_lang)[0]
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from fingerprint import content_fingerprint
+
+
+class TranslationCache:
+    """
+    Translations keyed by (source text fingerprint, target language): an
+    in-memory LRU in front of a SQLite table that survives restarts.
+    Both layers are size bounded and evict least recently used entries.
+    """
+
+    def __init__(self, db_path='.cache/translations.sqlite3', memory_entries=2048,
+                 max_rows=50000):
+        self.memory_entries = memory_entries
+        self.max_rows = max_rows
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS translations (
+                    fingerprint TEXT NOT NULL,
+                    lang TEXT NOT NULL,
+                    translated TEXT NOT NULL,
+                    used_at REAL NOT NULL,
+                    PRIMARY KEY (fingerprint, lang)
+                )''')
+            self.conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_translations_used ON translations(used_at)')
+
+    def _remember(self, key, translated):
+        # Caller holds the lock
+        self._memory[key] = translated
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text, target_lang):
+        key = (content_fingerprint(text), target_lang)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+            with self.conn:
+                row = self.conn.execute(
+                    'SELECT translated FROM translations WHERE fingerprint = ? AND lang = ?',
+                    key).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.conn.execute(
+                    'UPDATE translations SET used_at = ? WHERE fingerprint = ? AND lang = ?',
+                    (time.time(),) + key)
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, text, target_lang, translated):
+        key = (content_fingerprint(text), target_lang)
+        with self._lock:
+            self._remember(key, translated)
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                    key + (translated, time.time()))
+            self._puts += 1
+            if self._puts % 500 == 0:
+                self._evict()
+
+    def _evict(self):
+        with self.conn:
+            self.conn.execute(
+                '''DELETE FROM translations WHERE rowid NOT IN (
+                       SELECT rowid FROM translations ORDER BY used_at DESC LIMIT ?)''',
+                (self.max_rows,))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory)
+            }
+
+    def close(self):
+        self.conn.close()